@@ -2,17 +2,82 @@
 Module to hold auxiliary fuctions
 """
 
+import base64
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import date
+
 import pandas as pd
 import psycopg2
-from flask import jsonify
+from flask import Response, current_app, jsonify
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
+from config import (
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_IDLE_TIMEOUT, DB_POOL_HEALTH_CHECK_INTERVAL, DB_POOL_TIMEOUT,
+    STREAM_FETCH_SIZE, BATCH_MAX_PLAYERS
+)
 from db_values import HOST, DBNAME, USER, PASSWORD
+from sql_queries import DATA_VERSION_BUMP
 
 
 def convert_nan_to_none(value):
     """Convert pandas NaN to None."""
     return value if not pd.isna(value) else None
 
+def encode_cursor(match_date: date, match_id: int) -> str:
+    """Opaque pagination token for the position after the match (`match_date`, `match_id`)."""
+    position = json.dumps({"date": match_date.isoformat(), "match_id": match_id})
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def decode_cursor(token):
+    """(date, match_id) of a pagination token, or (None, None) without one. Raises ValueError if malformed."""
+    if not token:
+        return None, None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return date.fromisoformat(position["date"]), int(position["match_id"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+def bump_data_version(cur) -> int:
+    """
+    Mark the loaded data as changed, so the app drops its cached responses.
+
+    Run it in the transaction that changes the data: the new version becomes
+    visible in the same commit as the rows it stands for.
+    """
+    cur.execute(DATA_VERSION_BUMP)
+    return cur.fetchone()[0]
+
+def batch_players(args, max_players=BATCH_MAX_PLAYERS) -> dict:
+    """
+    Query params of a batch query for the players in repeated `name` and `id` request args.
+
+    Raises ValueError when no player, too many players or a non-numeric id is given.
+    """
+    names = list(dict.fromkeys(args.getlist('name')))
+    try:
+        ids = list(dict.fromkeys(int(player_id) for player_id in args.getlist('id')))
+    except ValueError as e:
+        raise ValueError("Player ids must be integers") from e
+    if not names and not ids:
+        raise ValueError("At least one player name or id is required")
+    if len(names) + len(ids) > max_players:
+        raise ValueError(f"At most {max_players} players can be requested at once")
+    return {"names": names, "ids": ids}
+
+def group_by_player(rows, key="player") -> dict:
+    """Rows of a batch query grouped into a list per player, without the `key` column."""
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row.pop(key), []).append(row)
+    return grouped
+
 def connect_to_db():
     try:
         # Set up the connection parameters to PostgreSQL
@@ -27,24 +92,229 @@ def connect_to_db():
     except Exception as e:
         print(f"Error connecting to database: {e}")
         return None
-    
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    Connections are reused most recently used first. One that sat idle for
+    longer than `health_check_interval` is checked with `SELECT 1` before
+    being handed out, and idle connections above `min_size` are closed after
+    `idle_timeout` seconds. When all `max_size` connections are in use,
+    `getconn` waits up to `timeout` seconds and then raises `PoolError`.
+    """
+
+    def __init__(self, min_size=DB_POOL_MIN_SIZE, max_size=DB_POOL_MAX_SIZE, idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                 health_check_interval=DB_POOL_HEALTH_CHECK_INTERVAL, timeout=DB_POOL_TIMEOUT, **conn_params):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.conn_params = conn_params or dict(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD)
+
+        self._idle = deque()  # (connection, time it was returned)
+        self._size = 0
+        self._cond = threading.Condition()
+        self._counters = dict(created=0, reused=0, closed_idle=0, discarded=0, waits=0, timeouts=0)
+
+    def getconn(self):
+        """Check out a healthy connection, opening a new one if there is room."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                conn, returned_at = self._checkout(deadline)
+            if conn is None:
+                return self._open()
+            if self._is_healthy(conn, returned_at):
+                with self._cond:
+                    self._counters["reused"] += 1
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn):
+        """Return a connection, ending any open transaction; broken ones are discarded."""
+        if not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                pass
+        if conn.closed:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        """Close every idle connection; checked-out ones are closed when returned."""
+        with self._cond:
+            while self._idle:
+                self._idle.popleft()[0].close()
+                self._size -= 1
+
+    def metrics(self) -> dict:
+        """Connections open, in use and idle, and counters since the pool was created."""
+        with self._cond:
+            idle = len(self._idle)
+            return dict(size=self._size, in_use=self._size - idle, idle=idle, max_size=self.max_size,
+                        **self._counters)
+
+    def _checkout(self, deadline):
+        """Take an idle connection, or reserve room for a new one (None), waiting if the pool is full."""
+        while True:
+            self._close_expired()
+            if self._idle:
+                return self._idle.pop()
+            if self._size < self.max_size:
+                self._size += 1
+                return None, None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._counters["timeouts"] += 1
+                raise PoolError(f"No database connection available after {self.timeout}s "
+                                f"({self.max_size} in use)")
+            self._counters["waits"] += 1
+            self._cond.wait(remaining)
+
+    def _close_expired(self):
+        """Close the connections idle for longer than `idle_timeout`, oldest first, down to `min_size`."""
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            self._idle.popleft()[0].close()
+            self._size -= 1
+            self._counters["closed_idle"] += 1
+
+    def _open(self):
+        try:
+            conn = psycopg2.connect(**self.conn_params)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters["created"] += 1
+        return conn
+
+    def _is_healthy(self, conn, returned_at) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - returned_at < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        finally:
+            with self._cond:
+                self._size -= 1
+                self._counters["discarded"] += 1
+                self._cond.notify()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """The process-wide connection pool, created on first use (and again in a forked child)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool, _pool_pid = ConnectionPool(), os.getpid()
+        return _pool
+
+@contextmanager
+def pooled_connection():
+    """Borrow a connection from the pool, committing on success and rolling back on error."""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        # An uncommitted transaction is rolled back when the connection is returned
+        pool.putconn(conn)
+
 def execute_query_with_params(query, params=None):
     """Execute SQL query with or without parameters and return results."""
-    conn = connect_to_db()
-    if conn is None:
+    try:
+        with pooled_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                if params:
+                    cur.execute(query, params)
+                else:
+                    cur.execute(query)
+
+                return cur.fetchall()
+    except psycopg2.OperationalError:
         return jsonify({"error": "Failed to connect to the database"}), 500
+    except Exception as e:
+        return {"error": str(e)}, 500
+
+def iter_query_rows(query, params=None, fetch_size=STREAM_FETCH_SIZE, exclude=()):
+    """
+    Yield the rows of a query as dicts, fetched `fetch_size` at a time from a server-side cursor.
 
+    Columns in `exclude` (e.g. only needed for ordering) are dropped from
+    every row. The pooled connection is held until the rows are exhausted or
+    the generator is closed (e.g. the client went away), then rolled back and returned.
+    """
+    with pooled_connection() as conn:
+        # Named cursors are declared in the database; only one is open per connection at a time
+        with conn.cursor(name="stream_rows", cursor_factory=RealDictCursor) as cur:
+            cur.itersize = fetch_size
+            cur.execute(query, params)
+            for row in cur:
+                for column in exclude:
+                    del row[column]
+                yield row
+
+def stream_json_response(rows, ndjson=False):
+    """
+    Stream `rows` as NDJSON (one object per line) or as a JSON array, without building the body in memory.
+
+    `rows` is a generator such as `iter_query_rows`, closed as soon as the
+    body is written or abandoned. The first row is read before responding, so
+    the query runs and database errors are answered with a 500 like
+    `execute_query_with_params` does.
+    """
+    dumps = current_app.json.dumps
     try:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        if params:
-            cur.execute(query, params)  
-        else:
-            cur.execute(query)
-
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
-        return results
+        first = next(rows, None)
+    except psycopg2.OperationalError:
+        return jsonify({"error": "Failed to connect to the database"}), 500
     except Exception as e:
         return {"error": str(e)}, 500
-    
\ No newline at end of file
+
+    def generate():
+        try:
+            if ndjson:
+                if first is not None:
+                    yield dumps(first) + "\n"
+                    for row in rows:
+                        yield dumps(row) + "\n"
+                return
+            if first is None:
+                yield "[]"
+                return
+            yield "[" + dumps(first)
+            for row in rows:
+                yield "," + dumps(row)
+            yield "]"
+        finally:
+            rows.close()
+
+    response = Response(generate(), mimetype="application/x-ndjson" if ndjson else "application/json")
+    # Close the cursor and return the connection even if the body is never iterated
+    response.call_on_close(rows.close)
+    return response
@@ -0,0 +1,72 @@
+"""
+Benchmark the row-by-row loader against the bulk (COPY + set-based) loader.
+
+Both loaders run on the same season data, tiled up to the requested number of
+matches, inside a transaction that is rolled back afterwards so the database
+is left untouched.
+
+Usage:
+    python benchmarks/bench_bulk_load.py path/to/2024.xlsx --matches 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+import psycopg2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_values import HOST, DBNAME, USER, PASSWORD
+from etl import (
+    extract_data_from_excel, validate_and_clean_data,
+    transform_and_insert_data, bulk_transform_and_insert_data)
+
+
+def tile_matches(df: pd.DataFrame, n_matches: int) -> pd.DataFrame:
+    """Repeat the season until it holds `n_matches` rows, shifting dates so every match stays unique."""
+    copies = []
+    for i in range(-(-n_matches // len(df))):
+        copy = df.copy()
+        copy["Date"] = copy["Date"] + pd.DateOffset(years=i)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True).head(n_matches)
+
+
+def time_loader(loader, df: pd.DataFrame, conn_params: dict) -> float:
+    """Time one loader run on a rolled back transaction."""
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            start = time.perf_counter()
+            loader(df, cur)
+            elapsed = time.perf_counter() - start
+        conn.rollback()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Season workbook (URL or local path).")
+    parser.add_argument("--matches", type=int, default=10_000, help="Number of matches to load.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--dbname", default=DBNAME)
+    parser.add_argument("--user", default=USER)
+    parser.add_argument("--password", default=PASSWORD)
+    args = parser.parse_args()
+
+    conn_params = dict(host=args.host, dbname=args.dbname, user=args.user, password=args.password)
+    df = tile_matches(validate_and_clean_data(extract_data_from_excel(args.source)), args.matches)
+    per_10k = 10_000 / len(df)
+
+    row_by_row = time_loader(transform_and_insert_data, df, conn_params)
+    bulk = time_loader(bulk_transform_and_insert_data, df, conn_params)
+
+    print(f"Matches loaded:      {len(df)}")
+    print(f"Row by row:          {row_by_row * per_10k:8.2f} s / 10k matches")
+    print(f"Bulk (COPY + upsert): {bulk * per_10k:7.2f} s / 10k matches")
+    print(f"Speedup:             {row_by_row / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark every ETL stage on synthetic seasons of growing size.
+
+For each size a synthetic season is generated and written to disk, then the
+extract, clean, transform and load stages are timed separately. The load runs
+against a local Postgres inside a transaction that is rolled back, so the
+database is left untouched. Results (seconds and rows per second per stage)
+are printed and saved as JSON so runs can be compared.
+
+Usage:
+    python benchmarks/bench_etl.py --sizes 10000 100000 1000000 --output benchmarks/results/etl.json
+    python benchmarks/bench_etl.py --compare benchmarks/results/etl.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import psycopg2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from db_values import HOST, DBNAME, USER, PASSWORD
+from etl import extract_data, validate_and_clean_data, transform_data, bulk_transform_and_insert_data
+from synthetic_data import generate_season, write_season
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def timed(func, *args):
+    """Run `func` and return its result and the elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_size(n_matches: int, file_format: str, conn_params: dict, workdir: str) -> dict:
+    """Time every stage of the ETL for one synthetic season."""
+    path = os.path.join(workdir, f"season_{n_matches}.{file_format}")
+    write_season(generate_season(n_matches), path)
+
+    df, extract_s = timed(extract_data, path)
+    df_cleaned, clean_s = timed(validate_and_clean_data, df)
+    _, transform_s = timed(transform_data, df_cleaned)
+
+    with psycopg2.connect(**conn_params) as conn:
+        with conn.cursor() as cur:
+            _, load_s = timed(bulk_transform_and_insert_data, df_cleaned, cur)
+        conn.rollback()
+
+    stages = {"extract": extract_s, "clean": clean_s, "transform": transform_s, "load": load_s}
+    return {
+        stage: {"seconds": round(seconds, 4), "rows_per_second": round(n_matches / seconds, 1)}
+        for stage, seconds in stages.items()
+    }
+
+
+def git_revision() -> str:
+    """Current git commit, if any."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(results: dict, baseline: dict = None) -> None:
+    """Print rows per second per stage, with the ratio to a baseline run when given."""
+    for size, stages in results.items():
+        print(f"\n{size} matches")
+        for stage, numbers in stages.items():
+            line = f"  {stage:<10} {numbers['seconds']:>10.3f} s {numbers['rows_per_second']:>14,.0f} rows/s"
+            if baseline and size in baseline and stage in baseline[size]:
+                ratio = numbers["rows_per_second"] / baseline[size][stage]["rows_per_second"]
+                line += f"   {ratio:5.2f}x vs baseline"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Season sizes in matches.")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv", help="Format of the generated files.")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", default=None, help="JSON results of a previous run to compare against.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--dbname", default=DBNAME)
+    parser.add_argument("--user", default=USER)
+    parser.add_argument("--password", default=PASSWORD)
+    args = parser.parse_args()
+
+    conn_params = dict(host=args.host, dbname=args.dbname, user=args.user, password=args.password)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {str(size): bench_size(size, args.format, conn_params, workdir) for size in args.sizes}
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_report(results, baseline)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "git_revision": git_revision(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "format": args.format,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Benchmark the betting simulator and the strategies on synthetic match frames of growing size.
+
+Runs offline, without a database. For each size a frame shaped like
+DATA_TO_SIMULATE (plus the odds of every bookmaker) is generated, and every
+benchmark is timed (best of a few runs) and then run once more under
+tracemalloc for its peak memory. The scaling exponent of each benchmark is the
+slope of log(time) against log(rows) over the sizes.
+
+With --compare, the run fails (exit code 1) when a benchmark is slower or
+uses more memory than the baseline by more than --threshold, or when its
+scaling exponent grows by more than --exponent-threshold.
+
+Usage:
+    python benchmarks/bench_simulator.py --output benchmarks/results/simulator.json
+    python benchmarks/bench_simulator.py --sizes 1000 10000 100000 --compare benchmarks/results/simulator.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.simulator import simulate_bets, simulate_by_player, backtest_bookmakers, BOOKMAKER_ODDS_COLUMNS
+from src.ledger import simulate_ledger
+from src.strategies import (
+    bet_on_smaller_odd, bet_on_smaller_odd_criteria, smaller_odd, smaller_odd_criteria, from_scalar
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+INITIAL_VALUE = 100
+BET_AMOUNT = 10
+
+# Legacy scalar strategies run one Python call per match, so they stop at this size
+SCALAR_MAX_ROWS = 100_000
+
+
+def simulation_frame(n_matches: int, n_players: int = 2000, seed: int = 0) -> pd.DataFrame:
+    """Synthetic matches with player names and the winner/loser odds of every bookmaker."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Player {i}." for i in range(n_players)], dtype=object)
+    winners = rng.integers(0, n_players, n_matches)
+    losers = (winners + rng.integers(1, n_players, n_matches)) % n_players
+
+    # Fair prices from the winner's chance, with a different margin per bookmaker
+    p_winner = rng.uniform(0.1, 0.9, n_matches)
+    df = pd.DataFrame({"match_id": np.arange(1, n_matches + 1), "Winner": names[winners], "Loser": names[losers]})
+    for margin, (winner_column, loser_column) in zip((0.06, 0.03, 0.0, 0.05), BOOKMAKER_ODDS_COLUMNS.values()):
+        df[winner_column] = np.round(1 / (p_winner * (1 + margin)), 2).clip(1.01)
+        df[loser_column] = np.round(1 / ((1 - p_winner) * (1 + margin)), 2).clip(1.01)
+
+    # A few matches without odds, which the simulator skips
+    df.loc[rng.random(n_matches) < 0.01, "AvgW"] = 0
+    return df
+
+
+def strategy_bench(strategy):
+    """Benchmark deciding every match of a frame with `strategy`."""
+    def run(df):
+        return strategy(df["AvgW"].to_numpy(), df["AvgL"].to_numpy(), df)
+    return run
+
+
+BENCHMARKS = {
+    "simulate_bets": (lambda df: simulate_bets(df, INITIAL_VALUE, BET_AMOUNT), None),
+    "simulate_by_player": (lambda df: simulate_by_player(df, INITIAL_VALUE, BET_AMOUNT), None),
+    "simulate_ledger": (lambda df: simulate_ledger(df, INITIAL_VALUE, BET_AMOUNT), None),
+    "backtest_bookmakers": (lambda df: backtest_bookmakers(df, INITIAL_VALUE, BET_AMOUNT), None),
+    "strategy:smaller_odd": (strategy_bench(smaller_odd), None),
+    "strategy:smaller_odd_criteria": (strategy_bench(smaller_odd_criteria), None),
+    "strategy:bet_on_smaller_odd": (strategy_bench(from_scalar(bet_on_smaller_odd)), SCALAR_MAX_ROWS),
+    "strategy:bet_on_smaller_odd_criteria": (strategy_bench(from_scalar(bet_on_smaller_odd_criteria)),
+                                             SCALAR_MAX_ROWS),
+}
+
+
+def measure(func, df: pd.DataFrame, repeats: int) -> dict:
+    """Best time over `repeats` runs, then peak traced memory of one more run."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func(df)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        func(df)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        "seconds": round(seconds, 6),
+        "rows_per_second": round(len(df) / seconds, 1),
+        "peak_memory_mb": round(peak / 2**20, 3),
+    }
+
+
+def scaling_exponent(sizes, seconds) -> float:
+    """Slope of log(time) against log(rows): 1.0 is linear."""
+    if len(sizes) < 2:
+        return float("nan")
+    return round(float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0]), 3)
+
+
+def run_benchmarks(sizes, names, repeats: int) -> dict:
+    """Results per benchmark: measurements per size and the scaling exponent."""
+    results = {name: {"sizes": {}} for name in names}
+    for size in sizes:
+        df = simulation_frame(size)
+        for name in names:
+            func, max_rows = BENCHMARKS[name]
+            if max_rows is None or size <= max_rows:
+                # Fewer repeats on large frames, where timings are stable anyway
+                results[name]["sizes"][str(size)] = measure(func, df, repeats if size <= 100_000 else 1)
+        del df
+
+    for result in results.values():
+        sizes_run = [int(size) for size in result["sizes"]]
+        seconds = [numbers["seconds"] for numbers in result["sizes"].values()]
+        # Tiny frames are dominated by fixed overhead, so fit from 10k rows when possible
+        fitted = [(n, s) for n, s in zip(sizes_run, seconds) if n >= 10_000]
+        if len(fitted) < 2:
+            fitted = list(zip(sizes_run, seconds))
+        result["scaling_exponent"] = scaling_exponent(*zip(*fitted)) if fitted else float("nan")
+    return results
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float, exponent_threshold: float) -> list:
+    """Describe every benchmark that got slower, bigger or scales worse than the baseline."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for size, numbers in result["sizes"].items():
+            before = baseline[name]["sizes"].get(size)
+            if before is None:
+                continue
+            if numbers["rows_per_second"] < before["rows_per_second"] * (1 - threshold):
+                regressions.append(f"{name} @ {size}: {numbers['rows_per_second']:,.0f} rows/s "
+                                   f"vs {before['rows_per_second']:,.0f} rows/s")
+            if numbers["peak_memory_mb"] > before["peak_memory_mb"] * (1 + threshold):
+                regressions.append(f"{name} @ {size}: peak {numbers['peak_memory_mb']:.1f} MB "
+                                   f"vs {before['peak_memory_mb']:.1f} MB")
+        exponent, before_exponent = result["scaling_exponent"], baseline[name]["scaling_exponent"]
+        if exponent - before_exponent > exponent_threshold:
+            regressions.append(f"{name}: scaling exponent {exponent:.2f} vs {before_exponent:.2f}")
+    return regressions
+
+
+def git_revision() -> str:
+    """Current git commit, if any."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(results: dict, baseline: dict = None) -> None:
+    """Print throughput and peak memory per size, and the scaling exponent of every benchmark."""
+    for name, result in results.items():
+        print(f"\n{name}  (scaling exponent {result['scaling_exponent']})")
+        for size, numbers in result["sizes"].items():
+            line = (f"  {int(size):>11,} rows {numbers['seconds']:>10.4f} s "
+                    f"{numbers['rows_per_second']:>16,.0f} rows/s {numbers['peak_memory_mb']:>10.1f} MB")
+            before = (baseline or {}).get(name, {}).get("sizes", {}).get(size)
+            if before:
+                line += f"   {numbers['rows_per_second'] / before['rows_per_second']:5.2f}x vs baseline"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Frame sizes in matches.")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per size (best is kept).")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", default=None, help="JSON results of a baseline run to check against.")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative loss of throughput or growth of peak memory.")
+    parser.add_argument("--exponent-threshold", type=float, default=0.15,
+                        help="Allowed growth of the scaling exponent.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(sorted(args.sizes), args.benchmarks, args.repeats)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_report(results, baseline)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "git_revision": git_revision(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.threshold, args.exponent_threshold)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
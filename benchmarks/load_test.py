@@ -0,0 +1,88 @@
+"""
+Load test of the API: many concurrent clients requesting a mix of routes for a fixed time.
+
+Compare server setups (workers, threads, response cache) with the same paths and clients, e.g.
+    gunicorn -w 2 -k gthread --threads 16 -b 0.0.0.0:5000 main:app
+
+Usage:
+    python benchmarks/load_test.py --url http://localhost:5000 --concurrency 200 --duration 30
+    python benchmarks/load_test.py --url http://localhost:5000 --paths "/player_details_get?name=Nadal%20R."
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import numpy as np
+
+DEFAULT_PATHS = [
+    "/tournament_matches",
+    "/wins_per_surface",
+    "/pre_match_atp_rank",
+    "/amount_after_simulation",
+    "/all_matches?limit=10",
+]
+
+
+async def client(session, url, paths, deadline, latencies, errors, offset):
+    """Request the paths in turn until the deadline, recording the latency of every answered request."""
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            async with session.get(url + path) as response:
+                await response.read()
+                if response.status >= 400:
+                    errors[response.status] = errors.get(response.status, 0) + 1
+                    continue
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load_test(url, paths, concurrency, duration, timeout):
+    """Requests per second, latency percentiles and errors of `concurrency` clients over `duration` seconds."""
+    latencies, errors = [], {}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(client(session, url, paths, deadline, latencies, errors, offset)
+                               for offset in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 1) if len(latencies) else None,
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 1) if len(latencies) else None,
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 1) if len(latencies) else None,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5000", help="Base URL of the server.")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS, help="Paths requested in turn by each client.")
+    parser.add_argument("--concurrency", type=int, default=200, help="Concurrent clients.")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run for.")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds before a request counts as failed.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load_test(args.url.rstrip("/"), args.paths, args.concurrency, args.duration,
+                                       args.timeout))
+    print(f"{args.url}  {args.concurrency} clients, {args.duration:.0f} s")
+    print(f"  {result['requests']} requests, {result['requests_per_second']:,.1f} requests/s")
+    print(f"  latency p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+    if result["errors"]:
+        print(f"  errors: {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
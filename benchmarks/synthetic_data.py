@@ -0,0 +1,156 @@
+"""
+Generate synthetic tennis-data.co.uk style seasons of any size.
+
+Matches are drawn from 32-player knockout draws, so every round, winner and
+loser is consistent, and carry set scores, ranks, points and the Bet365,
+Pinnacle, Max and Avg odds with the columns `etl.py` expects.
+
+Usage:
+    python benchmarks/synthetic_data.py --matches 100000 --output data/synthetic/season.csv
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+DRAW_SIZE = 32
+ROUNDS = ["1st Round", "2nd Round", "Quarterfinals", "Semifinals", "The Final"]
+TOURNAMENTS = [
+    # (Tournament, Location, Series, Court, Surface)
+    ("Australian Open", "Melbourne", "Grand Slam", "Outdoor", "Hard"),
+    ("French Open", "Paris", "Grand Slam", "Outdoor", "Clay"),
+    ("Wimbledon", "London", "Grand Slam", "Outdoor", "Grass"),
+    ("US Open", "New York", "Grand Slam", "Outdoor", "Hard"),
+    ("BNP Paribas Open", "Indian Wells", "Masters 1000", "Outdoor", "Hard"),
+    ("Miami Open", "Miami", "Masters 1000", "Outdoor", "Hard"),
+    ("Monte Carlo Masters", "Monte Carlo", "Masters 1000", "Outdoor", "Clay"),
+    ("Mutua Madrid Open", "Madrid", "Masters 1000", "Outdoor", "Clay"),
+    ("Internazionali BNL d'Italia", "Rome", "Masters 1000", "Outdoor", "Clay"),
+    ("Rolex Paris Masters", "Paris", "Masters 1000", "Indoor", "Hard"),
+    ("Qatar Exxon Mobil Open", "Doha", "ATP250", "Outdoor", "Hard"),
+    ("Rotterdam Open", "Rotterdam", "ATP500", "Indoor", "Hard"),
+    ("Barcelona Open", "Barcelona", "ATP500", "Outdoor", "Clay"),
+    ("Halle Open", "Halle", "ATP500", "Outdoor", "Grass"),
+    ("Swiss Indoors", "Basel", "ATP500", "Indoor", "Hard"),
+    ("Stockholm Open", "Stockholm", "ATP250", "Indoor", "Hard"),
+]
+BOOKMAKER_MARGINS = {"B365": 0.06, "PS": 0.03}
+
+
+def set_scores(rng: np.random.Generator, winner_sets: int, loser_sets: int) -> list:
+    """Draw game scores for every set, winner's sets first then shuffled."""
+    won = [(6, g) if g < 5 else (7, g) for g in rng.integers(0, 7, winner_sets)]
+    lost = [(g, 6) if g < 5 else (g, 7) for g in rng.integers(0, 7, loser_sets)]
+    sets = lost + won[:-1]
+    rng.shuffle(sets)
+    return sets + won[-1:]
+
+
+def generate_season(n_matches: int, seed: int = 0, n_players: int = 500, start_year: int = 2000) -> pd.DataFrame:
+    """
+    Generate `n_matches` matches with the columns of a tennis-data.co.uk season.
+
+    Parameters
+    ----------
+    n_matches : int
+        Number of matches (rows) to generate.
+    seed : int, optional
+        Seed of the random generator, the same seed always gives the same data.
+    n_players : int, optional
+        Size of the player pool.
+    start_year : int, optional
+        Year of the first tournament; tournaments are played weekly from there.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per match.
+    """
+    rng = np.random.default_rng(seed)
+    names = [f"Player{i:05d} A." for i in range(n_players)]
+    points = np.round(12000 / np.arange(1, n_players + 1) ** 0.9).astype(int)
+    skill = -0.6 * np.log(np.arange(1, n_players + 1))
+    start = pd.Timestamp(year=start_year, month=1, day=1)
+
+    rows = []
+    event = 0
+    while len(rows) < n_matches:
+        atp, (tournament, location, series, court, surface) = event % len(TOURNAMENTS), TOURNAMENTS[event % len(TOURNAMENTS)]
+        week = start + pd.Timedelta(weeks=event // 4)
+        best_of = 5 if series == "Grand Slam" else 3
+        draw = list(rng.choice(n_players, DRAW_SIZE, replace=False))
+
+        for round_index, round_name in enumerate(ROUNDS):
+            date = week + pd.Timedelta(days=round_index)
+            next_draw = []
+            for a, b in zip(draw[::2], draw[1::2]):
+                p_a = 1 / (1 + np.exp(skill[b] - skill[a]))
+                winner, loser = (a, b) if rng.random() < p_a else (b, a)
+                p_winner = p_a if winner == a else 1 - p_a
+                next_draw.append(winner)
+
+                needed = best_of // 2 + 1
+                loser_sets = int(rng.integers(0, needed))
+                comment = "Completed" if rng.random() > 0.03 else "Retired"
+                sets = set_scores(rng, needed, loser_sets)
+
+                odds = {}
+                for bookmaker, margin in BOOKMAKER_MARGINS.items():
+                    noise = rng.normal(0, 0.02)
+                    p = np.clip(p_winner + noise, 0.02, 0.98)
+                    odds[f"{bookmaker}W"] = max(1.01, round(1 / (p * (1 + margin)), 2))
+                    odds[f"{bookmaker}L"] = max(1.01, round(1 / ((1 - p) * (1 + margin)), 2))
+                odds["MaxW"] = round(max(odds["B365W"], odds["PSW"]) * 1.02, 2)
+                odds["MaxL"] = round(max(odds["B365L"], odds["PSL"]) * 1.02, 2)
+                odds["AvgW"] = round((odds["B365W"] + odds["PSW"]) / 2, 2)
+                odds["AvgL"] = round((odds["B365L"] + odds["PSL"]) / 2, 2)
+
+                row = {
+                    "ATP": atp + 1, "Location": location, "Tournament": tournament, "Date": date,
+                    "Series": series, "Court": court, "Surface": surface, "Round": round_name,
+                    "Best of": best_of, "Winner": names[winner], "Loser": names[loser],
+                    "WRank": winner + 1, "LRank": loser + 1,
+                    "WPts": points[winner], "LPts": points[loser],
+                }
+                for set_number in range(1, 6):
+                    w, l = sets[set_number - 1] if set_number <= len(sets) else (np.nan, np.nan)
+                    row[f"W{set_number}"], row[f"L{set_number}"] = w, l
+                row.update({"Wsets": needed, "Lsets": loser_sets, "Comment": comment})
+                row.update({
+                    "B365W": odds["B365W"], "B365L": odds["B365L"], "PSW": odds["PSW"], "PSL": odds["PSL"],
+                    "MaxW": odds["MaxW"], "MaxL": odds["MaxL"], "AvgW": odds["AvgW"], "AvgL": odds["AvgL"],
+                })
+                rows.append(row)
+            draw = next_draw
+        event += 1
+
+    return pd.DataFrame(rows[:n_matches])
+
+
+def write_season(df: pd.DataFrame, path: str) -> None:
+    """Write a season as CSV or xlsx depending on the file extension."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=10_000, help="Number of matches to generate.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--players", type=int, default=500, help="Size of the player pool.")
+    parser.add_argument("--start-year", type=int, default=2000)
+    parser.add_argument("--output", default="data/synthetic/season.csv", help="Output file (.csv or .xlsx).")
+    args = parser.parse_args()
+
+    df = generate_season(args.matches, seed=args.seed, n_players=args.players, start_year=args.start_year)
+    write_season(df, args.output)
+    print(f"{len(df)} matches written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
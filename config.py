@@ -8,4 +8,47 @@ URL_ATP = "https://www.atptour.com/en/rankings/singles"
 NAMES_MAPPING_FILE_PATH = 'data/names_mapping.csv'
 
 # Wheter to create main dataframe or not
-CREATE_MAIN_DF = True
\ No newline at end of file
+CREATE_MAIN_DF = True
+
+# Where parsed season workbooks are cached as Parquet
+WORKBOOK_CACHE_DIR = 'data/cache/workbooks'
+
+# Rows per chunk when streaming season files into the database,
+# which is also the commit batch of resumable loads
+ETL_CHUNK_SIZE = 10000
+
+# Stakes of the simulation shown on the players page
+SIMULATION_INITIAL_VALUE = 100
+SIMULATION_BET_AMOUNT = 10
+
+# Bootstrap resamples behind the leaderboard confidence intervals (0 to skip them)
+LEADERBOARD_RESAMPLES = 2000
+# Upper bound on bootstrap resamples, whatever the caller asks for: memory and time grow linearly with them
+MAX_BOOTSTRAP_RESAMPLES = 20000
+
+# Database connection pool shared by the Flask app, the enricher and the export job
+DB_POOL_MIN_SIZE = 1
+DB_POOL_MAX_SIZE = 10
+# Seconds an idle connection above the minimum is kept open
+DB_POOL_IDLE_TIMEOUT = 300
+# Seconds a connection may sit idle before it is checked with a `SELECT 1` on checkout
+DB_POOL_HEALTH_CHECK_INTERVAL = 30
+# Seconds to wait for a free connection when the pool is exhausted
+DB_POOL_TIMEOUT = 30
+
+# Rows per page of /all_matches, by default and at most
+ALL_MATCHES_PAGE_SIZE = 10
+ALL_MATCHES_MAX_PAGE_SIZE = 500
+
+# In-memory cache of the analytics endpoints of the Flask app
+RESPONSE_CACHE_MAX_ENTRIES = 256
+# Seconds a cached response is served for, even when no new data was loaded
+RESPONSE_CACHE_TTL = 600
+# Seconds between two reads of the data version the ETL bumps after every load
+DATA_VERSION_CHECK_INTERVAL = 2
+
+# Rows fetched per round trip by the server-side cursors of streamed responses
+STREAM_FETCH_SIZE = 2000
+
+# Most players a batch endpoint (e.g. /player_details_batch) answers for in one request
+BATCH_MAX_PLAYERS = 100
@@ -0,0 +1,62 @@
+"""
+Client of the Flask API that revalidates its last responses instead of refetching them.
+"""
+
+import threading
+from collections import OrderedDict
+
+import requests
+
+API_URL = "http://web:5000"
+# Responses remembered for revalidation, least recently used dropped first
+MAX_CACHED_RESPONSES = 128
+
+_responses = OrderedDict()  # (path, params) -> (ETag, Last-Modified, JSON body)
+_lock = threading.Lock()
+_session = requests.Session()
+
+
+def get_json(path, params=None, timeout=10):
+    """
+    GET `path` of the API and return its JSON body, or None if the request failed.
+
+    The ETag and Last-Modified of the last response to the same request are
+    sent back, and on a 304 the remembered body is returned without
+    downloading it again.
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+    with _lock:
+        cached = _responses.get(key)
+
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    try:
+        response = _session.get(f"{API_URL}{path}", params=params, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"Error fetching {path}: {e}")
+        return None
+
+    if response.status_code == 304 and cached:
+        with _lock:
+            _responses.move_to_end(key)
+        return cached[2]
+    if response.status_code != 200:
+        return None
+
+    body = response.json()
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    with _lock:
+        if etag or last_modified:
+            _responses[key] = (etag, last_modified, body)
+            _responses.move_to_end(key)
+            while len(_responses) > MAX_CACHED_RESPONSES:
+                _responses.popitem(last=False)
+        else:
+            _responses.pop(key, None)
+    return body
@@ -1,6 +1,6 @@
 import dash
-from dash import html, Input, Output, dash_table
-import requests
+from dash import html, dcc, Input, Output, State, dash_table
+from api_client import get_json
 
 dash.register_page(__name__)
 
@@ -19,8 +19,10 @@ def generate_table():
                 {"name": "Court type", "id": "court_type"},
                 {"name": "Comments", "id": "comments"},
             ],
+            page_action="custom",
             page_size=10,
             page_current=0,
+            page_count=1,
             style_header={'backgroundColor': 'green', 'fontWeight': 'bold', 'textAlign': 'center'},
             style_cell_conditional=[
                 {'if': {'column_id': c}, 'fontWeight': 'bold'} for c in ['winner_player', 'winner_sets', 'loser_sets', 'loser_player']
@@ -29,25 +31,37 @@ def generate_table():
             style_data={'textAlign': 'center'},
         )
 
-# Define existing callbacks for your home page
+# Fetch one page at a time, following the cursors handed out by the API
 @dash.callback(
     Output('match-table', 'data'),
-    Input('match-table', 'id')
+    Output('match-table', 'page_count'),
+    Output('match-cursors', 'data'),
+    Input('match-table', 'page_current'),
+    Input('match-table', 'page_size'),
+    State('match-cursors', 'data'),
 )
-def update_table_on_load(_):
-    # Fetch data from the Flask API
-    response = requests.get("http://web:5000/all_matches", timeout=10)
+def update_table_page(page_current, page_size, cursors):
+    # cursors[i] is the cursor of page i (None for the first page)
+    cursors = cursors or [None]
+    page_current = min(page_current or 0, len(cursors) - 1)
+    params = {"limit": page_size}
+    if cursors[page_current]:
+        params["cursor"] = cursors[page_current]
+    page = get_json("/all_matches", params=params, timeout=10)
 
     # Check if the response is successful
-    if response.status_code == 200:
-        matches = response.json()
-        return matches
-    else:
-        return []
+    if page is None:
+        return [], 1, cursors
+
+    cursors = cursors[:page_current + 1]
+    if page["next_cursor"]:
+        cursors.append(page["next_cursor"])
+    return page["matches"], len(cursors), cursors
 
 layout = html.Div(
     children=[
         html.H1('This is our Matches page!'),
+        dcc.Store(id='match-cursors', data=[None]),
         generate_table(),
     ]
 )
\ No newline at end of file
@@ -1,7 +1,7 @@
 import dash
 import dash_bootstrap_components as dbc
 from dash import html, dcc, Input, Output
-import requests  # To fetch data from the API
+from api_client import get_json
 
 dash.register_page(__name__, path='/')
 
@@ -77,6 +77,11 @@ def create_player_card(player):
                         # Position the rating (bottom-right corner)
                         html.Div(
                             f"Returns: {player.get('Net Gain/Loss Percentage (%)', 'N/A')}% 🤑",
+                            title=(
+                                f"95% CI: {player.get('Net Gain/Loss Percentage CI Low (%)', 'N/A')}% "
+                                f"to {player.get('Net Gain/Loss Percentage CI High (%)', 'N/A')}%, "
+                                f"profitable in {player.get('Probability of Profit (%)', 'N/A')}% of resamples"
+                            ),
                             style={
                             "position": "absolute",
                             "bottom": "10px",
@@ -102,14 +107,12 @@ def create_player_card(player):
     Input("players-container", "id"),  # Trigger fetching on page load
 )
 def fetch_players_data(_):
-    try:
-        response = requests.get("http://web:5000/amount_after_simulation")  # Replace with your API endpoint
-        response.raise_for_status()  # Raise an error for HTTP issues
-        data = response.json()  # Assuming the API returns a JSON list of players
-        return data
-    except Exception as e:
-        print(f"Error fetching players data: {e}")
+    # Revalidated with the API, so the leaderboard is only downloaded again after a new load
+    data = get_json("/amount_after_simulation")
+    if data is None:
+        print("Error fetching players data")
         return []
+    return data
     
 
 @dash.callback(
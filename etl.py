@@ -2,19 +2,101 @@
 Module providing an ETL process for tenis data
 """
 
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, List, NamedTuple, Optional
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 import psycopg2
 from psycopg2.extensions import cursor
+from psycopg2.extras import execute_values
 from db_values import HOST, DBNAME, USER, PASSWORD
-from aux import convert_nan_to_none
+from aux import convert_nan_to_none, bump_data_version
+from config import ETL_CHUNK_SIZE
+from workbook_cache import read_excel_cached
 from sql_queries import (
     PLAYER_INSERT, TOURNAMENT_INSERT, MATCH_INSERT, 
-    PLAYER_RANKING_INSERT, MATCH_SCORES_INSERT, BETTING_ODDS_INSERT)
+    PLAYER_RANKING_INSERT, MATCH_SCORES_INSERT, BETTING_ODDS_INSERT,
+    STAGING_MATCHES_CREATE, STAGING_MATCH_SCORES_CREATE, STAGING_BETTING_ODDS_CREATE,
+    STAGING_PLAYER_RANKINGS_CREATE, STAGING_COPY, STAGING_MATCH_IDS_CREATE,
+    BULK_PLAYERS_INSERT, BULK_TOURNAMENTS_INSERT, BULK_MATCHES_UPSERT,
+    BULK_MATCH_SCORES_INSERT, BULK_BETTING_ODDS_UPSERT, BULK_PLAYER_RANKINGS_UPSERT,
+    LOADED_ROWS_SELECT, LOADED_ROWS_UPSERT,
+    CHECKPOINT_SELECT, CHECKPOINT_UPSERT, CHECKPOINT_DELETE, REJECTED_ROW_INSERT)
 
-def extract_data_from_excel(url: str) -> pd.DataFrame:
-    """Extract data from an Excel file at the given URL and return a pandas DataFrame"""
+# Source columns in the order of the `staging_matches` table
+MATCH_COLUMNS = [
+    "ATP", "Tournament", "Location", "Surface", "Series", "Court",
+    "Date", "Round", "Best of", "Winner", "Loser",
+    "WRank", "LRank", "WPts", "LPts", "Wsets", "Lsets", "Comment",
+]
+SET_COLUMNS = [(f"W{set_number}", f"L{set_number}") for set_number in range(1, 6)]
+BOOKMAKER_COLUMNS = {
+    "Bet365": ("B365W", "B365L"),
+    "Pinnacle": ("PSW", "PSL"),
+    "Max": ("MaxW", "MaxL"),
+    "Avg": ("AvgW", "AvgL"),
+}
+SCORE_COLUMNS = [column for columns in SET_COLUMNS for column in columns]
+ODDS_COLUMNS = [column for columns in BOOKMAKER_COLUMNS.values() for column in columns]
+# Natural key of a match, mirroring the UNIQUE constraint on `matches`
+MATCH_KEY_COLUMNS = ["Tournament", "Date", "Round", "Winner", "Loser"]
+# Source columns holding text, hashed as strings whatever dtype the reader gave them
+TEXT_COLUMNS = ["Tournament", "Location", "Surface", "Series", "Court", "Round", "Winner", "Loser", "Comment"]
+SEASON_FILE_EXTENSIONS = (".xlsx", ".xls", ".csv")
+
+def extract_data_from_excel(url: str, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Extract data from an Excel file at the given URL and return a pandas DataFrame
+
+    Unless `use_cache` is False, the parsed workbook is served from the Parquet
+    cache, which is keyed by file content and refreshed when the file changes.
+    """
+    if use_cache:
+        return read_excel_cached(url)
     return pd.read_excel(url)
 
+def extract_data_from_csv(url: str) -> pd.DataFrame:
+    """Extract data from a CSV file at the given URL and return a pandas DataFrame"""
+    return pd.read_csv(url, parse_dates=["Date"])
+
+def extract_data(url: str) -> pd.DataFrame:
+    """Extract a season file, picking the reader from its extension."""
+    if url.lower().endswith(".csv"):
+        return extract_data_from_csv(url)
+    return extract_data_from_excel(url)
+
+def iter_excel_chunks(path: str, chunk_size: int = ETL_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Stream the first sheet of a workbook as DataFrames of at most `chunk_size` rows."""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+def iter_source_chunks(url: str, chunk_size: int = ETL_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Stream a CSV or Excel season file as DataFrames of at most `chunk_size` rows."""
+    if url.lower().endswith(".csv"):
+        chunks = pd.read_csv(url, chunksize=chunk_size)
+    else:
+        chunks = iter_excel_chunks(url, chunk_size)
+    for chunk in chunks:
+        chunk["Date"] = pd.to_datetime(chunk["Date"])
+        yield chunk
+
 def validate_and_clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     Validate that essential columns ('Winner' and 'Loser') are not missing.
@@ -60,7 +142,7 @@ def insert_betting_odds(match_id: int, row: pd.Series, cur: cursor) -> None:
     }
     for bookmaker, odds in bookmakers.items():
         winner_odds, loser_odds = odds
-        cur.execute(BETTING_ODDS_INSERT, (match_id, bookmaker, winner_odds, loser_odds))
+        cur.execute(BETTING_ODDS_INSERT, (match_id, bookmaker, convert_nan_to_none(winner_odds), convert_nan_to_none(loser_odds)))
 
 def insert_player_rankings(winner_id: int, loser_id: int, row: pd.Series, cur: cursor) -> None:
     """Insert player rankings for both winner and loser into the database."""
@@ -113,21 +195,385 @@ def transform_and_insert_data(df: pd.DataFrame, cur: cursor) -> None:
         insert_betting_odds(match_id, row, cur)
         insert_player_rankings(winner_id, loser_id, row, cur)
 
-def load_data_to_db(url: str) -> None:
+class TransformedMatches(NamedTuple):
+    """Long, table-shaped frames built from the wide source rows, linked by `row_number`."""
+
+    matches: pd.DataFrame
+    match_scores: pd.DataFrame
+    betting_odds: pd.DataFrame
+    player_rankings: pd.DataFrame
+
+def transform_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep the match level columns of the raw tennis data, numbered by source row."""
+    matches = df[MATCH_COLUMNS].reset_index(drop=True)
+    matches.insert(0, "row_number", np.arange(len(matches)))
+    return matches
+
+def transform_match_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """Reshape the W1..L5 columns into one row per played set."""
+    n_rows = len(df)
+    scores = df.reindex(columns=SCORE_COLUMNS).to_numpy(dtype=float).reshape(n_rows, len(SET_COLUMNS), 2)
+    long = pd.DataFrame({
+        "row_number": np.repeat(np.arange(n_rows), len(SET_COLUMNS)),
+        "set_number": np.tile(np.arange(1, len(SET_COLUMNS) + 1), n_rows),
+        "winner_score": scores[:, :, 0].ravel(),
+        "loser_score": scores[:, :, 1].ravel(),
+    })
+    return long[long["winner_score"].notna() & long["loser_score"].notna()]
+
+def transform_betting_odds(df: pd.DataFrame) -> pd.DataFrame:
+    """Reshape the winner/loser odds of every bookmaker into one row per match and bookmaker."""
+    n_rows = len(df)
+    odds = df[ODDS_COLUMNS].to_numpy(dtype=float).reshape(n_rows, len(BOOKMAKER_COLUMNS), 2)
+    return pd.DataFrame({
+        "row_number": np.repeat(np.arange(n_rows), len(BOOKMAKER_COLUMNS)),
+        "position": np.tile(np.arange(1, len(BOOKMAKER_COLUMNS) + 1), n_rows),
+        "bookmaker": np.tile(list(BOOKMAKER_COLUMNS), n_rows),
+        "winner_odds": odds[:, :, 0].ravel(),
+        "loser_odds": odds[:, :, 1].ravel(),
+    })
+
+def transform_player_rankings(df: pd.DataFrame) -> pd.DataFrame:
+    """Reshape WRank/WPts and LRank/LPts into one ranking row per player and match, winner first."""
+    n_rows = len(df)
+    row_number = np.arange(n_rows)
+    winners = pd.DataFrame({
+        "row_number": row_number, "position": row_number * 2,
+        "player": df["Winner"].to_numpy(), "ranking_date": df["Date"].to_numpy(),
+        "rank": df["WRank"].to_numpy(), "points": df["WPts"].to_numpy(),
+    })
+    losers = pd.DataFrame({
+        "row_number": row_number, "position": row_number * 2 + 1,
+        "player": df["Loser"].to_numpy(), "ranking_date": df["Date"].to_numpy(),
+        "rank": df["LRank"].to_numpy(), "points": df["LPts"].to_numpy(),
+    })
+    return pd.concat([winners, losers]).sort_values("position", kind="stable").reset_index(drop=True)
+
+def transform_data(df: pd.DataFrame) -> TransformedMatches:
+    """
+    Transform raw tennis data into long frames for the whole DataFrame at once.
+
+    Missing values are left as NaN and are written as NULL by the loaders.
+    """
+    return TransformedMatches(
+        matches=transform_matches(df),
+        match_scores=transform_match_scores(df),
+        betting_odds=transform_betting_odds(df),
+        player_rankings=transform_player_rankings(df),
+    )
+
+def copy_frame(df: pd.DataFrame, table: str, cur: cursor) -> None:
+    """COPY a DataFrame laid out like `table` into it."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cur.copy_expert(STAGING_COPY.format(table=table), buffer)
+
+def bulk_transform_and_insert_data(df: pd.DataFrame, cur: cursor) -> None:
+    """
+    Transform raw tennis data and insert it into the database with set-based statements.
+
+    The transformed frames are streamed with COPY into temporary staging tables
+    and every target table is then upserted with a single INSERT ... SELECT,
+    producing the same rows as `transform_and_insert_data`.
+    """
+    transformed = transform_data(df)
+
+    cur.execute(STAGING_MATCHES_CREATE)
+    cur.execute(STAGING_MATCH_SCORES_CREATE)
+    cur.execute(STAGING_BETTING_ODDS_CREATE)
+    cur.execute(STAGING_PLAYER_RANKINGS_CREATE)
+    copy_frame(transformed.matches, "staging_matches", cur)
+    copy_frame(transformed.match_scores, "staging_match_scores", cur)
+    copy_frame(transformed.betting_odds, "staging_betting_odds", cur)
+    copy_frame(transformed.player_rankings, "staging_player_rankings", cur)
+
+    cur.execute(BULK_PLAYERS_INSERT)
+    cur.execute(BULK_TOURNAMENTS_INSERT)
+    cur.execute(BULK_MATCHES_UPSERT)
+    cur.execute(STAGING_MATCH_IDS_CREATE)
+    cur.execute(BULK_MATCH_SCORES_INSERT)
+    cur.execute(BULK_BETTING_ODDS_UPSERT)
+    cur.execute(BULK_PLAYER_RANKINGS_UPSERT)
+
+def normalise_loaded_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The loaded columns of `df` with one dtype each, whichever reader produced them.
+
+    `read_excel` and the Parquet cache infer float columns where the streamed
+    openpyxl and CSV chunks may hold objects, and a chunk's dtypes depend on
+    its rows: text becomes str (missing as ""), dates datetime64[ns] and
+    everything else float.
+    """
+    columns = [c for c in MATCH_COLUMNS + SCORE_COLUMNS + ODDS_COLUMNS if c in df.columns]
+    normalised = pd.DataFrame(index=df.index)
+    for column in columns:
+        values = df[column]
+        if column in TEXT_COLUMNS:
+            normalised[column] = values.where(values.notna(), "").astype(str)
+        elif column == "Date":
+            normalised[column] = pd.to_datetime(values).astype("datetime64[ns]")
+        else:
+            normalised[column] = pd.to_numeric(values, errors="coerce").astype(float)
+    return normalised
+
+def compute_match_keys(df: pd.DataFrame) -> pd.Series:
+    """Build a text key per row from the natural key of the match."""
+    keys = normalise_loaded_columns(df[MATCH_KEY_COLUMNS]).astype(str)
+    return keys[MATCH_KEY_COLUMNS[0]].str.cat([keys[c] for c in MATCH_KEY_COLUMNS[1:]], sep="|")
+
+def compute_row_hashes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Hash the loaded columns of every row, keyed by match.
+
+    Columns are normalised first, so the same file hashes the same through
+    every reader. Hashes are stored as signed 64-bit integers to fit a BIGINT column.
+    """
+    hashes = pd.util.hash_pandas_object(normalise_loaded_columns(df), index=False).to_numpy().view("int64")
+    return pd.DataFrame({"match_key": compute_match_keys(df), "row_hash": hashes}, index=df.index)
+
+def select_changed_rows(df: pd.DataFrame, source: str, cur: cursor) -> pd.DataFrame:
+    """
+    Keep only the rows of matches that are new or changed since the last load of `source`.
+
+    A match is compared through the hash of its last row in the source, so a
+    match listed twice is either reloaded entirely or skipped entirely. Only
+    the stored hashes of the matches in `df` are read, so chunked loads stay
+    linear in the size of the file.
+    """
+    row_hashes = compute_row_hashes(df)
+    cur.execute(LOADED_ROWS_SELECT, (source, row_hashes["match_key"].unique().tolist()))
+    loaded_hashes = dict(cur.fetchall())
+
+    latest = row_hashes.drop_duplicates(subset="match_key", keep="last")
+    changed_keys = latest.loc[latest["match_key"].map(loaded_hashes) != latest["row_hash"], "match_key"]
+
+    return df[row_hashes["match_key"].isin(changed_keys)]
+
+def record_loaded_rows(df: pd.DataFrame, source: str, cur: cursor) -> None:
+    """Store the hash of every loaded match so the next incremental run can skip it."""
+    latest = compute_row_hashes(df).drop_duplicates(subset="match_key", keep="last")
+    rows = [(source, key, int(row_hash)) for key, row_hash in zip(latest["match_key"], latest["row_hash"])]
+    execute_values(cur, LOADED_ROWS_UPSERT, rows)
+
+def load_frame(df: pd.DataFrame, source: str, cur: cursor, bulk: bool = False, incremental: bool = False) -> int:
+    """
+    Load a cleaned DataFrame read from `source` and return the number of rows written.
+
+    With `incremental`, matches whose source row is unchanged since the last
+    load of `source` are skipped, and only new or changed matches are written.
+    """
+    if incremental:
+        df = select_changed_rows(df, source, cur)
+        print(f"{len(df)} new or changed rows to load from {source}.")
+        if df.empty:
+            return 0
+    if bulk:
+        bulk_transform_and_insert_data(df, cur)
+    else:
+        transform_and_insert_data(df, cur)
+    if incremental:
+        record_loaded_rows(df, source, cur)
+    return len(df)
+
+def load_data_to_db(url: str, bulk: bool = False, incremental: bool = False) -> None:
     """Extract, transform, and load data from the given URL into the database."""
-    df = extract_data_from_excel(url)
+    df = extract_data(url)
     with psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD) as conn:
         with conn.cursor() as cur:
             # Pre-process and clean the DataFrame
             df_cleaned = validate_and_clean_data(df)
             # Process the DataFrame
-            transform_and_insert_data(df_cleaned, cur)
+            load_frame(df_cleaned, url, cur, bulk=bulk, incremental=incremental)
+            bump_data_version(cur)
+    print("Data inserted!")
+
+def stream_data_to_db(url: str, chunk_size: int = ETL_CHUNK_SIZE,
+                      bulk: bool = True, incremental: bool = False) -> None:
+    """
+    Extract, transform, and load a season file chunk by chunk.
+
+    Each chunk of `chunk_size` rows is validated, loaded and committed before
+    the next one is read, so memory use depends on the chunk size and not on
+    the size of the file.
+    """
+    total_rows = 0
+    with psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD) as conn:
+        with conn.cursor() as cur:
+            for chunk in iter_source_chunks(url, chunk_size):
+                total_rows += load_frame(validate_and_clean_data(chunk), url, cur,
+                                         bulk=bulk, incremental=incremental)
+                bump_data_version(cur)
+                conn.commit()
+                print(f"{total_rows} rows loaded from {url}.")
+    print("Data inserted!")
+
+# Errors that reject a row: from the database, or converting its values in transform_data
+ROW_ERRORS = (psycopg2.Error, ValueError, TypeError)
+
+def load_batch_or_reject(df: pd.DataFrame, source: str, cur: cursor,
+                         bulk: bool = True, incremental: bool = False) -> int:
+    """
+    Load a batch, falling back to one row at a time when the batch fails.
+
+    Rows that still fail on their own are written to `etl_rejected_rows`, with
+    their source offset (the DataFrame index) and the database or conversion
+    error, instead of aborting the batch. Returns the number of rows loaded.
+    """
+    cur.execute("SAVEPOINT batch")
+    try:
+        loaded = load_frame(df, source, cur, bulk=bulk, incremental=incremental)
+        cur.execute("RELEASE SAVEPOINT batch")
+        return loaded
+    except ROW_ERRORS:
+        cur.execute("ROLLBACK TO SAVEPOINT batch")
+
+    loaded = 0
+    for offset in df.index:
+        row = df.loc[[offset]]
+        cur.execute("SAVEPOINT single_row")
+        try:
+            loaded += load_frame(row, source, cur, bulk=bulk, incremental=incremental)
+            cur.execute("RELEASE SAVEPOINT single_row")
+        except ROW_ERRORS as e:
+            cur.execute("ROLLBACK TO SAVEPOINT single_row")
+            row_data = row.to_json(orient="records", date_format="iso")[1:-1]
+            cur.execute(REJECTED_ROW_INSERT, (source, int(offset), str(e).strip(), row_data))
+            print(f"Rejected row {offset} of {source}: {str(e).strip()}")
+    return loaded
+
+def resumable_load_to_db(url: str, batch_size: int = ETL_CHUNK_SIZE, bulk: bool = True,
+                         incremental: bool = False, restart: bool = False) -> None:
+    """
+    Load a season file in committed batches that a restarted run can resume from.
+
+    After each batch of `batch_size` source rows is committed, its end offset
+    is recorded in `etl_checkpoints`; the next run of the same source skips
+    every row before that offset. Failing rows go to `etl_rejected_rows`.
+    With `restart`, the checkpoint is dropped and the whole file is loaded again.
+    """
+    with psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD) as conn:
+        with conn.cursor() as cur:
+            if restart:
+                cur.execute(CHECKPOINT_DELETE, (url,))
+            cur.execute(CHECKPOINT_SELECT, (url,))
+            checkpoint = cur.fetchone()
+            resume_offset = checkpoint[0] if checkpoint else 0
+            if resume_offset:
+                print(f"Resuming {url} from row {resume_offset}.")
+
+            batch_start = 0
+            for chunk in iter_source_chunks(url, batch_size):
+                batch_end = batch_start + len(chunk)
+                chunk.index = pd.RangeIndex(batch_start, batch_end)
+                batch = chunk.loc[resume_offset:] if batch_start < resume_offset else chunk
+                if not batch.empty:
+                    load_batch_or_reject(validate_and_clean_data(batch), url, cur,
+                                         bulk=bulk, incremental=incremental)
+                    cur.execute(CHECKPOINT_UPSERT, (url, batch_end))
+                    bump_data_version(cur)
+                    conn.commit()
+                    print(f"Committed rows up to {batch_end} of {url}.")
+                batch_start = batch_end
+    print("Data inserted!")
+
+def list_season_files(sources: List[str]) -> List[str]:
+    """Expand directories into the season files they contain, keeping the given order otherwise."""
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            files.extend(sorted(
+                os.path.join(source, name) for name in os.listdir(source)
+                if name.lower().endswith(SEASON_FILE_EXTENSIONS)
+            ))
+        else:
+            files.append(source)
+    return files
+
+def extract_and_clean(source: str) -> pd.DataFrame:
+    """Extract and clean one season file (runs in a worker process)."""
+    return validate_and_clean_data(extract_data(source))
+
+# Connection owned by each worker process of `load_seasons_to_db`
+_worker_conn = None
+
+def _open_worker_connection() -> None:
+    """Open the database connection of a worker process."""
+    global _worker_conn
+    _worker_conn = psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD)
+
+def _load_season(df: pd.DataFrame, source: str, bulk: bool, incremental: bool) -> int:
+    """Load one cleaned season on the worker connection, in its own transaction."""
+    with _worker_conn:
+        with _worker_conn.cursor() as cur:
+            return load_frame(df, source, cur, bulk=bulk, incremental=incremental)
+
+def load_seasons_to_db(sources: List[str], workers: Optional[int] = None,
+                       bulk: bool = True, incremental: bool = False) -> None:
+    """
+    Load many season files in parallel worker processes.
+
+    1. Workers extract and clean the files in parallel.
+    2. All players and tournaments are registered up front, in file order, in a
+       single transaction, so every worker resolves the same `player_id` and
+       `tournament_id` and none of them ever waits on another one's insert into
+       the `players.name` / `tournaments.name` unique indexes.
+    3. Workers load the matches of one file each on their own connection.
+    """
+    files = list_season_files(sources)
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(extract_and_clean, files))
+
+    with psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD) as conn:
+        with conn.cursor() as cur:
+            for df in frames:
+                insert_players(df, cur)
+                insert_tournaments(df, cur)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_connection) as pool:
+        loaded = pool.map(_load_season, frames, files, repeat(bulk), repeat(incremental))
+        for source, rows in zip(files, loaded):
+            print(f"Loaded {rows} rows from {source}.")
+
+    # Once, after every worker committed, rather than serialising the workers on the counter row
+    with psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD) as conn:
+        with conn.cursor() as cur:
+            bump_data_version(cur)
     print("Data inserted!")
 
 def main():
     """Main ETL process entry point."""
-    URL = "http://tennis-data.co.uk/2024/20234.xlsx"
-    load_data_to_db(URL)
+    parser = argparse.ArgumentParser(description="Load tennis-data.co.uk seasons into the database.")
+    parser.add_argument("sources", nargs="*", default=["http://tennis-data.co.uk/2024/20234.xlsx"],
+                        help="Season files (URL or local path) or directories of season files.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes used when loading several files (default: one per core).")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Load through COPY and set-based upserts instead of row by row.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only load matches that are new or changed since the last load of this source.")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help=f"Stream a local file in chunks of this many rows (e.g. {ETL_CHUNK_SIZE}) "
+                             "to keep memory bounded.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Commit every chunk, checkpoint the source offset and resume from it on the next run; "
+                             "failing rows are rejected instead of aborting the load.")
+    parser.add_argument("--restart", action="store_true",
+                        help="With --resume, ignore the stored checkpoint and load the whole file again.")
+    args = parser.parse_args()
+
+    files = list_season_files(args.sources)
+    if len(files) == 1 and args.resume:
+        resumable_load_to_db(files[0], batch_size=args.chunk_size or ETL_CHUNK_SIZE, bulk=args.bulk,
+                             incremental=args.incremental, restart=args.restart)
+    elif len(files) == 1 and args.chunk_size:
+        stream_data_to_db(files[0], chunk_size=args.chunk_size, bulk=args.bulk, incremental=args.incremental)
+    elif len(files) == 1:
+        load_data_to_db(files[0], bulk=args.bulk, incremental=args.incremental)
+    else:
+        load_seasons_to_db(files, workers=args.workers, bulk=args.bulk, incremental=args.incremental)
 
 if __name__ == "__main__":
     main()
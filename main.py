@@ -1,98 +1,171 @@
 """Main Module to call the Flask App"""
 
+from datetime import date
+
 import pandas as pd
-from src.simulator import simulate_by_player
+from config import (
+    SIMULATION_INITIAL_VALUE, SIMULATION_BET_AMOUNT, ALL_MATCHES_PAGE_SIZE, ALL_MATCHES_MAX_PAGE_SIZE
+)
+from src.simulator import backtest_bookmakers
+from src.ledger import simulate_ledger
 from flask import Flask, request, jsonify
-from aux import execute_query_with_params
+from aux import (
+    execute_query_with_params, iter_query_rows, stream_json_response, get_pool, encode_cursor, decode_cursor,
+    batch_players, group_by_player
+)
+from response_cache import response_cache, conditional_get
 from sql_queries import (
     AVG_POINTS_BY_PLAYER_QUERY, COUNT_GAMES_PER_TOURNAMENT_QUERY, 
     WINS_PER_SURFACE_QUERY, CURRENT_PRE_MATCH_ATP_RANKINGS_QUERY,
-    PLAYER_DETAILS_QUERY, PLAYER_RANKING_HISTORY_QUERY, ALL_MATCHES_QUERY,
+    PLAYER_DETAILS_QUERY, PLAYER_RANKING_HISTORY_QUERY, ALL_MATCHES_PAGE_QUERY,
     ODDS,
-    DATA_TO_SIMULATE
+    DATA_TO_SIMULATE_FOR_PLAYER_NAME, DATA_TO_SIMULATE_ALL_BOOKMAKERS, LEADERBOARD_QUERY,
+    PLAYER_DETAILS_BATCH_QUERY, PLAYER_RANKING_HISTORY_BATCH_QUERY, ODDS_BATCH
 )
-from src.visual_addons import process_nationality_and_atp_code
 
 app = Flask(__name__)
 
 @app.route('/all_matches', methods=['GET'])
+@conditional_get
+@response_cache.cached
 def get_all_matches():
-    matches = execute_query_with_params(ALL_MATCHES_QUERY) 
-    # Get filtering parameters
-    surface = request.args.get('surface')
-    court = request.args.get('court')
-
-    # Filter matches in Python
-    if surface:
-        matches = [match for match in matches if match['surface'] == surface]
-    if court:
-        matches = [match for match in matches if match['court_type'] == court]
-
-    return jsonify(matches)
+    # Filters are applied in SQL and each page resumes after the cursor of the previous one.
+    # With ?stream=ndjson (or ?stream=json for a JSON array) every matching row is streamed instead.
+    stream = request.args.get('stream')
+    if stream not in (None, 'ndjson', 'json'):
+        return jsonify({"error": "stream must be 'ndjson' or 'json'"}), 400
+    limit = request.args.get('limit', default=None if stream else ALL_MATCHES_PAGE_SIZE, type=int)
+    if limit is not None:
+        limit = max(1, limit if stream else min(limit, ALL_MATCHES_MAX_PAGE_SIZE))
+    try:
+        after_date, after_match_id = decode_cursor(request.args.get('cursor'))
+        date_from, date_to = (date.fromisoformat(request.args[name]) if request.args.get(name) else None
+                              for name in ('date_from', 'date_to'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    params = {name: request.args.get(name) or None for name in ('surface', 'court', 'tournament', 'player')}
+    params.update(date_from=date_from, date_to=date_to, after_date=after_date, after_match_id=after_match_id)
+    if stream:
+        rows = iter_query_rows(ALL_MATCHES_PAGE_QUERY, dict(params, limit=limit), exclude=('date',))
+        return stream_json_response(rows, ndjson=stream == 'ndjson')
+
+    params.update(limit=limit + 1)
+    matches = execute_query_with_params(ALL_MATCHES_PAGE_QUERY, params)
+    if isinstance(matches, tuple):
+        return matches
+
+    # One extra row tells whether there is a next page
+    next_cursor = None
+    if len(matches) > limit:
+        matches = matches[:limit]
+        next_cursor = encode_cursor(matches[-1]['date'], matches[-1]['match_id'])
+    for match in matches:
+        del match['date']
+
+    return jsonify({"matches": matches, "next_cursor": next_cursor})
 
 @app.route('/avg_points_by_playerzzz', methods=['GET'])
+@conditional_get
+@response_cache.cached
 def get_avg_points_by_player():
     print("Here!!!!!!!!!!!!!!!!!!")
     results = execute_query_with_params(AVG_POINTS_BY_PLAYER_QUERY)
+    if isinstance(results, tuple):
+        return results
     return jsonify(results)
 
 @app.route('/amount_after_simulation', methods=['GET'])
+@conditional_get
 def get_amount_after_simulation():
-    # Gather data
-    results = execute_query_with_params(DATA_TO_SIMULATE)
+    # Precomputed after every ETL run by src/leaderboard.py
+    results = execute_query_with_params(LEADERBOARD_QUERY)
+    if isinstance(results, tuple):
+        return results
+    return jsonify(results)
+
+@app.route('/simulation_bets', methods=['GET'])
+@conditional_get
+def get_simulation_bets():
+    # Drill down into the bets of one player, e.g. ?player=Nadal R.
+    player = request.args.get('player')
+    if not player:
+        return jsonify({"error": "Player name is required"}), 400
+
+    # Only the player's own matches, so their bankroll runs in order of play
+    results = execute_query_with_params(DATA_TO_SIMULATE_FOR_PLAYER_NAME, {"player": player})
+    if isinstance(results, tuple):
+        return results
+    if not results:
+        return jsonify([])
     df = pd.DataFrame(results)
+    ledger = simulate_ledger(df, SIMULATION_INITIAL_VALUE, SIMULATION_BET_AMOUNT).for_player(player)
+    bets = ledger.to_frame()
+    bets["bet_result"] = bets["bet_result"].map(lambda result: result.name)
+    return jsonify(bets.to_dict(orient="records"))
+
+@app.route('/bookmaker_backtest', methods=['GET'])
+@conditional_get
+def get_bookmaker_backtest():
+    # All bookmakers are loaded once and simulated together
+    results = execute_query_with_params(DATA_TO_SIMULATE_ALL_BOOKMAKERS)
+    if isinstance(results, tuple):
+        return results
+    df = pd.DataFrame(results)
+    res = backtest_bookmakers(df, SIMULATION_INITIAL_VALUE, SIMULATION_BET_AMOUNT)
+    return jsonify(res.to_dict(orient="records"))
 
-    # Simulate bet
-    INITIAL_VALUE = 100
-    BET_AMOUNT = 10
-    res = simulate_by_player(df, INITIAL_VALUE, BET_AMOUNT)
-    
-    # Format output
-    res["amount_rank"] = res["Net Gain/Loss (€)"].rank(method="dense", ascending=False)
-    res.sort_values("amount_rank", ascending=True, inplace=True)
-    #print(res.head(2))
-
-    # Get Players info
-    players_info = execute_query_with_params("SELECT * FROM players")
-    df_players_info = pd.DataFrame(players_info)
-    #print(df_players_info.columns)
-
-    # Merge players info with the results
-    merged_df = res.merge(
-        df_players_info,
-        how='left',
-        left_on='Player',
-        right_on='name',
-    )
-    df_w_visuals = process_nationality_and_atp_code(merged_df)
-
-    return jsonify(df_w_visuals.to_dict(orient="records"))
+@app.route('/db_pool_metrics', methods=["GET"])
+def get_db_pool_metrics():
+    # Connections open, in use and idle in this worker's pool
+    return jsonify(get_pool().metrics())
+
+@app.route('/response_cache_metrics', methods=["GET"])
+def get_response_cache_metrics():
+    # Hits, misses and invalidations of this worker's response cache
+    return jsonify(response_cache.metrics())
 
 @app.route('/tournament_matches', methods=["GET"])
+@conditional_get
+@response_cache.cached
 def get_tournament_matches():
     results = execute_query_with_params(COUNT_GAMES_PER_TOURNAMENT_QUERY)
+    if isinstance(results, tuple):
+        return results
     return jsonify(results)
 
 @app.route('/wins_per_surface', methods=["GET"])
+@conditional_get
+@response_cache.cached
 def get_wins_per_surface():
     results = execute_query_with_params(WINS_PER_SURFACE_QUERY)
+    if isinstance(results, tuple):
+        return results
     return jsonify(results)
 
 @app.route('/pre_match_atp_rank', methods=["GET"])
+@conditional_get
+@response_cache.cached
 def get_pre_match_atp_rank():
     results = execute_query_with_params(CURRENT_PRE_MATCH_ATP_RANKINGS_QUERY)
+    if isinstance(results, tuple):
+        return results
     return jsonify(results)
 
 @app.route('/player_details_get', methods=['GET'])
+@conditional_get
 def get_player_details():
     player_name = request.args.get('name')  
     if not player_name:
         return jsonify({"error": "Player name is required"}), 400
     
     results = execute_query_with_params(PLAYER_DETAILS_QUERY, (player_name,))
-    return jsonify(results), 200
+    if isinstance(results, tuple):
+        return results
+    return jsonify(results)
 
 @app.route("/historical_player_rank", methods=['GET'])
+@conditional_get
 def get_historical_player_rank():
     player_name = request.args.get('name')
     print(player_name)
@@ -100,14 +173,17 @@ def get_historical_player_rank():
         return jsonify({"error": "Player name is required"}), 400
     
     results = execute_query_with_params(PLAYER_RANKING_HISTORY_QUERY, (player_name,))
-    return jsonify(results), 200
+    if isinstance(results, tuple):
+        return results
+    return jsonify(results)
 
 @app.route('/historical_odds_matches', methods=['GET'])
+@conditional_get
 def historical_matches():
     player_name = request.args.get('name')
     print(player_name)
-    results_q = execute_query_with_params(ODDS, (player_name,))
-    print(results_q)
+    # Streamed from a server-side cursor, as a JSON array or with ?stream=ndjson one match per line
+    results_q = iter_query_rows(ODDS, (player_name,))
 
     # Format the data into a list of dictionaries
     """results = []
@@ -120,7 +196,48 @@ def historical_matches():
             "result": row[2]
         })
     """
-    return jsonify(results_q)
+    return stream_json_response(results_q, ndjson=request.args.get('stream') == 'ndjson')
+
+# Batch variants of the player routes, e.g. ?name=Nadal R.&name=Federer R.&id=42,
+# answering with one query per dataset and the rows grouped by player name
+@app.route('/player_details_batch', methods=['GET'])
+@conditional_get
+def get_player_details_batch():
+    try:
+        params = batch_players(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = execute_query_with_params(PLAYER_DETAILS_BATCH_QUERY, params)
+    if isinstance(results, tuple):
+        return results
+    return jsonify({row["name"]: row for row in results}), 200
+
+@app.route('/historical_player_rank_batch', methods=['GET'])
+@conditional_get
+def get_historical_player_rank_batch():
+    try:
+        params = batch_players(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = execute_query_with_params(PLAYER_RANKING_HISTORY_BATCH_QUERY, params)
+    if isinstance(results, tuple):
+        return results
+    return jsonify(group_by_player(results)), 200
+
+@app.route('/historical_odds_matches_batch', methods=['GET'])
+@conditional_get
+def historical_matches_batch():
+    try:
+        params = batch_players(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = execute_query_with_params(ODDS_BATCH, params)
+    if isinstance(results, tuple):
+        return results
+    return jsonify(group_by_player(results)), 200
 
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=5002)
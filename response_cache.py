@@ -0,0 +1,182 @@
+"""
+Module providing an in-memory cache of Flask responses and conditional GETs, both keyed on the data version
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, current_app, request
+from werkzeug.http import is_resource_modified
+from aux import execute_query_with_params
+from config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL, DATA_VERSION_CHECK_INTERVAL
+from sql_queries import DATA_VERSION_SELECT
+
+
+def load_data_version():
+    """(version, time of the last load) of the loaded data, or (None, None) when it can't be read."""
+    rows = execute_query_with_params(DATA_VERSION_SELECT)
+    if isinstance(rows, tuple) or not rows:
+        return None, None
+    return rows[0]["version"], rows[0]["updated_at"]
+
+
+class DataVersion:
+    """
+    Version of the loaded data, which the ETL bumps whenever it commits new data.
+
+    It is read from the database at most every `check_interval` seconds, so
+    changes are noticed within that delay.
+    """
+
+    def __init__(self, check_interval=DATA_VERSION_CHECK_INTERVAL, loader=load_data_version):
+        self.check_interval = check_interval
+        self.loader = loader
+        self._version = self._updated_at = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """(version, time of the last load), or (None, None) when unknown."""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._version, self._updated_at
+
+        version, updated_at = self.loader()
+        with self._lock:
+            self._version, self._updated_at, self._checked_at = version, updated_at, now
+            return version, updated_at
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of successful responses, keyed by route and query args.
+
+    Entries expire after `ttl` seconds and the least recently used one is
+    evicted beyond `max_entries`. The whole cache is dropped when the data
+    version changes; while it can't be read, requests bypass the cache.
+    """
+
+    def __init__(self, data_version, max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data_version = data_version
+
+        self._entries = OrderedDict()  # key -> (expires at, body, status, headers)
+        self._version = None
+        self._lock = threading.Lock()
+        self._counters = dict(hits=0, misses=0, bypasses=0, expirations=0, evictions=0, invalidations=0)
+
+    def cached(self, view):
+        """Decorator serving a view from the cache, for GET routes whose output only depends on the data."""
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            # Read before running the view, so a load committing meanwhile invalidates the entry
+            version = self.data_version()
+            if version is None:
+                with self._lock:
+                    self._counters["bypasses"] += 1
+                return view(*args, **kwargs)
+
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            response = self.get(key)
+            if response is not None:
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            self.put(key, version, response)
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+
+    def data_version(self):
+        """The current data version, dropping every entry computed from an older one."""
+        version, _ = self._data_version.get()
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self._counters["invalidations"] += 1
+                self._entries.clear()
+                self._version = version
+            return version
+
+    def get(self, key):
+        """The cached response for `key`, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, body, status, headers = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+        response = Response(body, status=status, headers=headers)
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    def put(self, key, version, response) -> None:
+        """Store a successful response computed from the data at `version`."""
+        if response.status_code != 200 or response.is_streamed:
+            return
+        entry = (time.monotonic() + self.ttl, response.get_data(), response.status_code, list(response.headers))
+        with self._lock:
+            # Computed before a version change seen by another request: don't bring stale data back
+            if version != self._version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        """Entries held, the data version they were computed from, and counters since start-up."""
+        with self._lock:
+            return dict(entries=len(self._entries), max_entries=self.max_entries, ttl=self.ttl,
+                        data_version=self._version, **self._counters)
+
+
+def conditional_get(view):
+    """
+    Decorator tagging the responses of a view with the data version, and answering 304 while it is unchanged.
+
+    The ETag and Last-Modified come from the data version, so a client
+    repeating the request with If-None-Match / If-Modified-Since gets a 304
+    without the view (or its query) running. Views whose output only depends
+    on the loaded data and the request can use it.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version, updated_at = data_version.get()
+        if version is None:
+            return view(*args, **kwargs)
+
+        etag = f"data-{version}"
+        if not is_resource_modified(request.environ, etag=etag, last_modified=updated_at):
+            response = Response(status=304)
+        else:
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.last_modified = updated_at
+        # Let clients keep the response, but have them check it is still current before reusing it
+        response.cache_control.no_cache = True
+        return response
+    return wrapper
+
+
+# Data version and response cache of the Flask app, one per worker process
+data_version = DataVersion()
+response_cache = ResponseCache(data_version)
@@ -21,6 +21,11 @@ run_containers() {
         echo "Data export complete!"
     }
 
+    # Precompute the simulation leaderboard served to the players page
+    echo "Refreshing the simulation leaderboard..."
+    docker-compose exec web python src/leaderboard.py
+    echo "Leaderboard refreshed!"
+
     # Show logs from all services in a separate background process
     #docker-compose logs -f &
 }
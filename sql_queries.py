@@ -6,7 +6,15 @@ table_names = (
     "matches",
     "tournaments", 
     "match_scores", 
-    "betting_odds"
+    "betting_odds",
+    "etl_loaded_rows",
+    "etl_checkpoints",
+    "etl_rejected_rows",
+    "simulation_runs",
+    "simulation_state",
+    "simulation_bets",
+    "simulation_leaderboard",
+    "data_version"
 )
 
 # CREATE TABLES
@@ -65,6 +73,11 @@ CREATE TABLE IF NOT EXISTS tournaments (
 );
 """
 
+# Serves the newest-first keyset pagination of /all_matches
+MATCHES_DATE_INDEX_CREATE = """
+CREATE INDEX IF NOT EXISTS matches_date_match_id_idx ON matches (date DESC, match_id DESC);
+"""
+
 MATCH_SCORES_TABLE_CREATE = """
 CREATE TABLE IF NOT EXISTS match_scores (
   score_id SERIAL PRIMARY KEY,
@@ -82,10 +95,112 @@ CREATE TABLE IF NOT EXISTS betting_odds (
   bookmaker VARCHAR(50),
   winner_odds DECIMAL(5, 2),
   loser_odds DECIMAL(5, 2),
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   UNIQUE (match_id, bookmaker)
 );
 """
 
+ETL_LOADED_ROWS_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS etl_loaded_rows (
+  source VARCHAR(255) NOT NULL,
+  match_key TEXT NOT NULL,
+  row_hash BIGINT NOT NULL,
+  loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (source, match_key)
+);
+"""
+
+ETL_CHECKPOINTS_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS etl_checkpoints (
+  source VARCHAR(255) PRIMARY KEY,
+  last_offset INT NOT NULL,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+ETL_REJECTED_ROWS_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS etl_rejected_rows (
+  reject_id SERIAL PRIMARY KEY,
+  source VARCHAR(255) NOT NULL,
+  source_offset INT NOT NULL,
+  error TEXT,
+  row_data JSONB,
+  rejected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+SIMULATION_RUNS_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS simulation_runs (
+  strategy_key CHAR(40) PRIMARY KEY,
+  strategy VARCHAR(255) NOT NULL,
+  initial_value NUMERIC NOT NULL,
+  bet_amount NUMERIC NOT NULL,
+  -- Matches and odds updated from this time on are folded in by the next refresh (NULL: never synced)
+  synced_at TIMESTAMP,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+SIMULATION_STATE_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS simulation_state (
+  strategy_key CHAR(40) REFERENCES simulation_runs(strategy_key) ON DELETE CASCADE,
+  player_id INT REFERENCES players(player_id) ON DELETE CASCADE,
+  net_result DOUBLE PRECISION NOT NULL,
+  num_wins INT NOT NULL,
+  num_losses INT NOT NULL,
+  PRIMARY KEY (strategy_key, player_id)
+);
+"""
+
+# Bets placed by each simulation, so a refresh can take back the bets of matches updated in place
+SIMULATION_BETS_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS simulation_bets (
+  strategy_key CHAR(40) REFERENCES simulation_runs(strategy_key) ON DELETE CASCADE,
+  match_id INT NOT NULL,
+  winner_id INT NOT NULL,
+  loser_id INT NOT NULL,
+  won BOOLEAN NOT NULL,
+  net_result DOUBLE PRECISION NOT NULL,
+  PRIMARY KEY (strategy_key, match_id)
+);
+"""
+
+SIMULATION_LEADERBOARD_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS simulation_leaderboard (
+  player_id INT PRIMARY KEY REFERENCES players(player_id) ON DELETE CASCADE,
+  amount_rank INT NOT NULL,
+  num_wins INT NOT NULL,
+  num_losses INT NOT NULL,
+  win_percentage DOUBLE PRECISION,
+  final_amount DOUBLE PRECISION,
+  net_gain_loss DOUBLE PRECISION,
+  net_gain_loss_percentage DOUBLE PRECISION,
+  num_played_games INT NOT NULL,
+  net_gain_loss_ci_low DOUBLE PRECISION,
+  net_gain_loss_ci_high DOUBLE PRECISION,
+  net_gain_loss_percentage_ci_low DOUBLE PRECISION,
+  net_gain_loss_percentage_ci_high DOUBLE PRECISION,
+  win_percentage_ci_low DOUBLE PRECISION,
+  win_percentage_ci_high DOUBLE PRECISION,
+  probability_of_profit DOUBLE PRECISION,
+  country VARCHAR(100),
+  flag VARCHAR(16),
+  picture_url TEXT,
+  refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS simulation_leaderboard_rank_idx ON simulation_leaderboard (amount_rank, player_id);
+"""
+
+# Single-row counter bumped whenever loaded data changes, to invalidate the app caches
+DATA_VERSION_TABLE_CREATE = """
+CREATE TABLE IF NOT EXISTS data_version (
+  id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+  version BIGINT NOT NULL,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO data_version (id, version) VALUES (TRUE, 0) ON CONFLICT (id) DO NOTHING;
+"""
+
 # INSERT RECORDS
 PLAYER_INSERT = """
 INSERT INTO players (name)
@@ -137,7 +252,414 @@ INSERT INTO betting_odds (match_id, bookmaker, winner_odds, loser_odds)
 VALUES (%s, %s, %s, %s)
 ON CONFLICT (match_id, bookmaker) DO UPDATE SET
     winner_odds = EXCLUDED.winner_odds,
-    loser_odds = EXCLUDED.loser_odds;
+    loser_odds = EXCLUDED.loser_odds,
+    updated_at = CURRENT_TIMESTAMP;
+"""
+
+LOADED_ROWS_SELECT = """
+SELECT match_key, row_hash
+FROM etl_loaded_rows
+WHERE source = %s AND match_key = ANY(%s);
+"""
+
+LOADED_ROWS_UPSERT = """
+INSERT INTO etl_loaded_rows (source, match_key, row_hash)
+VALUES %s
+ON CONFLICT (source, match_key) DO UPDATE SET
+    row_hash = EXCLUDED.row_hash,
+    loaded_at = CURRENT_TIMESTAMP;
+"""
+
+CHECKPOINT_SELECT = """
+SELECT last_offset
+FROM etl_checkpoints
+WHERE source = %s;
+"""
+
+CHECKPOINT_UPSERT = """
+INSERT INTO etl_checkpoints (source, last_offset)
+VALUES (%s, %s)
+ON CONFLICT (source) DO UPDATE SET
+    last_offset = EXCLUDED.last_offset,
+    updated_at = CURRENT_TIMESTAMP;
+"""
+
+CHECKPOINT_DELETE = """
+DELETE FROM etl_checkpoints
+WHERE source = %s;
+"""
+
+REJECTED_ROW_INSERT = """
+INSERT INTO etl_rejected_rows (source, source_offset, error, row_data)
+VALUES (%s, %s, %s, %s::jsonb);
+"""
+
+# INCREMENTAL SIMULATION STATE
+SIMULATION_RUN_INSERT = """
+INSERT INTO simulation_runs (strategy_key, strategy, initial_value, bet_amount)
+VALUES (%s, %s, %s, %s)
+ON CONFLICT (strategy_key) DO NOTHING;
+"""
+
+SIMULATION_RUN_LOCK = """
+SELECT synced_at FROM simulation_runs
+WHERE strategy_key = %s
+FOR UPDATE;
+"""
+
+SIMULATION_RUN_UPDATE = """
+UPDATE simulation_runs
+SET synced_at = %s, updated_at = NOW()
+WHERE strategy_key = %s;
+"""
+
+# Runs of an older version of the same strategy and stakes are dropped with their state
+SIMULATION_STALE_RUNS_DELETE = """
+DELETE FROM simulation_runs
+WHERE strategy = %s AND initial_value = %s AND bet_amount = %s AND strategy_key <> %s;
+"""
+
+SIMULATION_STATE_DELETE = """
+DELETE FROM simulation_state
+WHERE strategy_key = %s;
+"""
+
+# Players left without any bet, who have no row after a full recompute either
+SIMULATION_STATE_EMPTY_DELETE = """
+DELETE FROM simulation_state
+WHERE strategy_key = %s AND num_wins + num_losses = 0;
+"""
+
+SIMULATION_STATE_UPSERT = """
+INSERT INTO simulation_state (strategy_key, player_id, net_result, num_wins, num_losses)
+VALUES %s
+ON CONFLICT (strategy_key, player_id) DO UPDATE SET
+  net_result = simulation_state.net_result + EXCLUDED.net_result,
+  num_wins = simulation_state.num_wins + EXCLUDED.num_wins,
+  num_losses = simulation_state.num_losses + EXCLUDED.num_losses;
+"""
+
+SIMULATION_BETS_DELETE = """
+DELETE FROM simulation_bets
+WHERE strategy_key = %s;
+"""
+
+SIMULATION_BETS_INSERT = """
+INSERT INTO simulation_bets (strategy_key, match_id, winner_id, loser_id, won, net_result)
+VALUES %s;
+"""
+
+# Remove the bets on the matches in %(match_ids)s and subtract them from the totals of both players
+SIMULATION_BETS_TAKE_BACK = """
+WITH taken_back AS (
+    DELETE FROM simulation_bets
+    WHERE strategy_key = %(key)s AND match_id = ANY(%(match_ids)s)
+    RETURNING winner_id, loser_id, won, net_result
+), per_player AS (
+    SELECT
+        p.player_id,
+        SUM(t.net_result) AS net_result,
+        COUNT(*) FILTER (WHERE t.won) AS num_wins,
+        COUNT(*) FILTER (WHERE NOT t.won) AS num_losses
+    FROM taken_back t
+    CROSS JOIN LATERAL (VALUES (t.winner_id), (t.loser_id)) AS p(player_id)
+    GROUP BY p.player_id
+)
+UPDATE simulation_state s
+SET net_result = s.net_result - p.net_result,
+    num_wins = s.num_wins - p.num_wins,
+    num_losses = s.num_losses - p.num_losses
+FROM per_player p
+WHERE s.strategy_key = %(key)s AND s.player_id = p.player_id;
+"""
+
+# Time from which updated rows must be folded in by the next refresh: now, or the start of the oldest
+# other open transaction, whose rows carry that start as `updated_at` even if they commit later
+SIMULATION_WATERMARK_SELECT = """
+SELECT LEAST(clock_timestamp(), MIN(xact_start))::TIMESTAMP
+FROM pg_stat_activity
+WHERE datname = current_database() AND xact_start IS NOT NULL AND pid <> pg_backend_pid();
+"""
+
+SIMULATION_STATE_SELECT = """
+SELECT
+    p.name AS "Player",
+    s.num_wins,
+    s.num_losses,
+    r.initial_value::DOUBLE PRECISION + s.net_result AS running_total
+FROM simulation_state s
+JOIN simulation_runs r ON r.strategy_key = s.strategy_key
+JOIN players p ON p.player_id = s.player_id
+WHERE s.strategy_key = %s
+ORDER BY p.player_id;
+"""
+
+# SIMULATION LEADERBOARD
+LEADERBOARD_DELETE = """
+DELETE FROM simulation_leaderboard;
+"""
+
+# Confidence intervals of the stored leaderboard, kept for the players whose matches didn't change
+LEADERBOARD_INTERVALS_SELECT = """
+SELECT
+    p.name AS "Player",
+    l.net_gain_loss_ci_low AS "Net Gain/Loss CI Low (€)",
+    l.net_gain_loss_ci_high AS "Net Gain/Loss CI High (€)",
+    l.net_gain_loss_percentage_ci_low AS "Net Gain/Loss Percentage CI Low (%)",
+    l.net_gain_loss_percentage_ci_high AS "Net Gain/Loss Percentage CI High (%)",
+    l.win_percentage_ci_low AS "Win Percentage CI Low (%)",
+    l.win_percentage_ci_high AS "Win Percentage CI High (%)",
+    l.probability_of_profit AS "Probability of Profit (%)"
+FROM simulation_leaderboard l
+JOIN players p ON p.player_id = l.player_id
+WHERE l.probability_of_profit IS NOT NULL;
+"""
+
+LEADERBOARD_INSERT = """
+INSERT INTO simulation_leaderboard (
+  player_id, amount_rank, num_wins, num_losses, win_percentage, final_amount, net_gain_loss,
+  net_gain_loss_percentage, num_played_games, net_gain_loss_ci_low, net_gain_loss_ci_high,
+  net_gain_loss_percentage_ci_low, net_gain_loss_percentage_ci_high, win_percentage_ci_low,
+  win_percentage_ci_high, probability_of_profit, country, flag, picture_url
+)
+VALUES %s;
+"""
+
+# DATA VERSION
+DATA_VERSION_SELECT = """
+SELECT version, updated_at FROM data_version;
+"""
+
+DATA_VERSION_BUMP = """
+INSERT INTO data_version (id, version) VALUES (TRUE, 1)
+ON CONFLICT (id) DO UPDATE SET version = data_version.version + 1, updated_at = NOW()
+RETURNING version;
+"""
+
+# BULK LOAD (COPY into staging tables + set-based upserts)
+STAGING_MATCHES_CREATE = """
+DROP TABLE IF EXISTS staging_matches;
+CREATE TEMP TABLE staging_matches (
+  row_number INT PRIMARY KEY,
+  tournament_atp NUMERIC,
+  tournament VARCHAR(100),
+  location VARCHAR(100),
+  surface VARCHAR(50),
+  series VARCHAR(50),
+  court VARCHAR(50),
+  date DATE,
+  round VARCHAR(50),
+  best_of NUMERIC,
+  winner VARCHAR(100),
+  loser VARCHAR(100),
+  winner_rank NUMERIC,
+  loser_rank NUMERIC,
+  winner_pts NUMERIC,
+  loser_pts NUMERIC,
+  winner_sets NUMERIC,
+  loser_sets NUMERIC,
+  comments TEXT
+) ON COMMIT DROP;
+"""
+
+STAGING_MATCH_SCORES_CREATE = """
+DROP TABLE IF EXISTS staging_match_scores;
+CREATE TEMP TABLE staging_match_scores (
+  row_number INT,
+  set_number INT,
+  winner_score NUMERIC,
+  loser_score NUMERIC
+) ON COMMIT DROP;
+"""
+
+STAGING_BETTING_ODDS_CREATE = """
+DROP TABLE IF EXISTS staging_betting_odds;
+CREATE TEMP TABLE staging_betting_odds (
+  row_number INT,
+  position INT,
+  bookmaker VARCHAR(50),
+  winner_odds NUMERIC,
+  loser_odds NUMERIC
+) ON COMMIT DROP;
+"""
+
+STAGING_PLAYER_RANKINGS_CREATE = """
+DROP TABLE IF EXISTS staging_player_rankings;
+CREATE TEMP TABLE staging_player_rankings (
+  row_number INT,
+  position INT,
+  player VARCHAR(100),
+  ranking_date DATE,
+  rank NUMERIC,
+  points NUMERIC
+) ON COMMIT DROP;
+"""
+
+STAGING_COPY = """
+COPY {table} FROM STDIN WITH (FORMAT csv)
+"""
+
+# Players and tournaments keep the first-seen order of the row-by-row loader,
+# so serial ids are handed out exactly as `insert_players`/`insert_tournaments` do.
+BULK_PLAYERS_INSERT = """
+INSERT INTO players (name)
+SELECT name
+FROM (
+    SELECT winner AS name, row_number AS position FROM staging_matches
+    UNION ALL
+    SELECT loser, row_number + (SELECT COUNT(*) FROM staging_matches) FROM staging_matches
+) p
+GROUP BY name
+ORDER BY MIN(position)
+ON CONFLICT (name) DO NOTHING;
+"""
+
+BULK_TOURNAMENTS_INSERT = """
+INSERT INTO tournaments (tournament_ATP, name, location, surface, series, court)
+SELECT tournament_atp, tournament, location, surface, series, court
+FROM staging_matches
+GROUP BY tournament_atp, tournament, location, surface, series, court
+ORDER BY MIN(row_number)
+ON CONFLICT (name) DO NOTHING;
+"""
+
+# Serial ids are drawn once per source row, in source order, and a match that
+# appears more than once keeps the id of its first row and the values of its
+# last one, exactly as consecutive MATCH_INSERT upserts would leave it.
+BULK_MATCHES_UPSERT = """
+WITH resolved AS (
+    SELECT
+        s.*,
+        t.tournament_id,
+        w.player_id AS winner_id,
+        l.player_id AS loser_id
+    FROM staging_matches s
+    JOIN tournaments t ON t.name = s.tournament
+    JOIN players w ON w.name = s.winner
+    JOIN players l ON l.name = s.loser
+),
+attempts AS MATERIALIZED (
+    SELECT row_number, nextval(pg_get_serial_sequence('matches', 'match_id')) AS match_id
+    FROM resolved
+    ORDER BY row_number
+),
+latest AS (
+    SELECT DISTINCT ON (r.tournament_id, r.date, r.round, r.winner_id, r.loser_id)
+        r.*,
+        FIRST_VALUE(a.match_id) OVER (
+            PARTITION BY r.tournament_id, r.date, r.round, r.winner_id, r.loser_id
+            ORDER BY r.row_number
+        ) AS match_id
+    FROM resolved r
+    JOIN attempts a USING (row_number)
+    ORDER BY r.tournament_id, r.date, r.round, r.winner_id, r.loser_id, r.row_number DESC
+)
+INSERT INTO matches (
+    match_id, tournament_id, date, round, best_of, winner_id, loser_id,
+    winner_rank, loser_rank, winner_pts, loser_pts, winner_sets, loser_sets, comments
+)
+SELECT
+    match_id, tournament_id, date, round, best_of, winner_id, loser_id,
+    winner_rank, loser_rank, winner_pts, loser_pts, winner_sets, loser_sets, comments
+FROM latest
+ORDER BY match_id
+ON CONFLICT (tournament_id, date, round, winner_id, loser_id)
+DO UPDATE SET
+    winner_rank = EXCLUDED.winner_rank,
+    loser_rank = EXCLUDED.loser_rank,
+    winner_pts = EXCLUDED.winner_pts,
+    loser_pts = EXCLUDED.loser_pts,
+    winner_sets = EXCLUDED.winner_sets,
+    loser_sets = EXCLUDED.loser_sets,
+    comments = EXCLUDED.comments,
+    updated_at = CURRENT_TIMESTAMP;
+"""
+
+STAGING_MATCH_IDS_CREATE = """
+DROP TABLE IF EXISTS staging_match_ids;
+CREATE TEMP TABLE staging_match_ids ON COMMIT DROP AS
+SELECT s.row_number, m.match_id
+FROM staging_matches s
+JOIN tournaments t ON t.name = s.tournament
+JOIN players w ON w.name = s.winner
+JOIN players l ON l.name = s.loser
+JOIN matches m
+  ON m.tournament_id = t.tournament_id
+ AND m.date = s.date
+ AND m.round = s.round
+ AND m.winner_id = w.player_id
+ AND m.loser_id = l.player_id;
+"""
+
+BULK_MATCH_SCORES_INSERT = """
+INSERT INTO match_scores (match_id, set_number, winner_score, loser_score)
+SELECT ids.match_id, s.set_number, s.winner_score, s.loser_score
+FROM staging_match_scores s
+JOIN staging_match_ids ids USING (row_number)
+ORDER BY s.row_number, s.set_number;
+"""
+
+BULK_BETTING_ODDS_UPSERT = """
+WITH odds AS (
+    SELECT ids.match_id, s.row_number, s.position, s.bookmaker, s.winner_odds, s.loser_odds
+    FROM staging_betting_odds s
+    JOIN staging_match_ids ids USING (row_number)
+),
+attempts AS MATERIALIZED (
+    SELECT row_number, position, nextval(pg_get_serial_sequence('betting_odds', 'odds_id')) AS odds_id
+    FROM odds
+    ORDER BY row_number, position
+),
+latest AS (
+    SELECT DISTINCT ON (o.match_id, o.bookmaker)
+        o.*,
+        FIRST_VALUE(a.odds_id) OVER (
+            PARTITION BY o.match_id, o.bookmaker ORDER BY o.row_number
+        ) AS odds_id
+    FROM odds o
+    JOIN attempts a USING (row_number, position)
+    ORDER BY o.match_id, o.bookmaker, o.row_number DESC
+)
+INSERT INTO betting_odds (odds_id, match_id, bookmaker, winner_odds, loser_odds)
+SELECT odds_id, match_id, bookmaker, winner_odds, loser_odds
+FROM latest
+ORDER BY odds_id
+ON CONFLICT (match_id, bookmaker) DO UPDATE SET
+    winner_odds = EXCLUDED.winner_odds,
+    loser_odds = EXCLUDED.loser_odds,
+    updated_at = CURRENT_TIMESTAMP;
+"""
+
+BULK_PLAYER_RANKINGS_UPSERT = """
+WITH rankings AS (
+    SELECT p.player_id, s.ranking_date, s.rank, s.points, s.position
+    FROM staging_player_rankings s
+    JOIN staging_match_ids ids USING (row_number)
+    JOIN players p ON p.name = s.player
+),
+attempts AS MATERIALIZED (
+    SELECT position, nextval(pg_get_serial_sequence('player_rankings', 'ranking_id')) AS ranking_id
+    FROM rankings
+    ORDER BY position
+),
+latest AS (
+    SELECT DISTINCT ON (r.player_id, r.ranking_date)
+        r.*,
+        FIRST_VALUE(a.ranking_id) OVER (
+            PARTITION BY r.player_id, r.ranking_date ORDER BY r.position
+        ) AS ranking_id
+    FROM rankings r
+    JOIN attempts a USING (position)
+    ORDER BY r.player_id, r.ranking_date, r.position DESC
+)
+INSERT INTO player_rankings (ranking_id, player_id, ranking_date, rank, points)
+SELECT ranking_id, player_id, ranking_date, rank, points
+FROM latest
+ORDER BY ranking_id
+ON CONFLICT (player_id, ranking_date)
+DO UPDATE SET
+    rank = EXCLUDED.rank,
+    points = EXCLUDED.points;
 """
 
 # QUERY LISTS
@@ -146,8 +668,17 @@ CREATE_TABLE_QUERIES = [
     PLAYER_RANKINGS_TABLE_CREATE,
     TOURNAMENTS_TABLE_CREATE,
     MATCHES_TABLE_CREATE,
+    MATCHES_DATE_INDEX_CREATE,
     MATCH_SCORES_TABLE_CREATE,
-    BETTING_ODDS_TABLE_CREATE
+    BETTING_ODDS_TABLE_CREATE,
+    ETL_LOADED_ROWS_TABLE_CREATE,
+    ETL_CHECKPOINTS_TABLE_CREATE,
+    ETL_REJECTED_ROWS_TABLE_CREATE,
+    SIMULATION_RUNS_TABLE_CREATE,
+    SIMULATION_STATE_TABLE_CREATE,
+    SIMULATION_BETS_TABLE_CREATE,
+    SIMULATION_LEADERBOARD_TABLE_CREATE,
+    DATA_VERSION_TABLE_CREATE
 ]
 
 DROP_TABLE_QUERIES = [f"DROP TABLE IF EXISTS {table}" for table in table_names]
@@ -243,6 +774,60 @@ WHERE p.name = %s
 ORDER BY pr.ranking_date ASC;
 """
 
+# Batch variants for many players at once, by name and/or id, with the player's name in every row.
+# Params: names (list of names, matched like in the single-player queries, but without ILIKE
+# wildcards in the details one) and ids (list of player ids).
+PLAYER_DETAILS_BATCH_QUERY = """
+SELECT *
+FROM players p
+JOIN LATERAL (
+  SELECT * FROM player_rankings pr
+  WHERE pr.player_id = p.player_id
+  ORDER BY pr.ranking_date DESC
+  LIMIT 1
+) pr ON TRUE
+WHERE LOWER(p.name) = ANY(SELECT LOWER(name) FROM UNNEST(%(names)s::TEXT[]) AS name)
+  OR p.player_id = ANY(%(ids)s::INT[]);
+"""
+
+PLAYER_RANKING_HISTORY_BATCH_QUERY = """
+SELECT
+  p.name AS player,
+  TO_CHAR(pr.ranking_date, 'DD-MM-YYYY') AS ranking_date,
+  pr.rank
+FROM players p
+JOIN player_rankings pr ON p.player_id = pr.player_id
+WHERE p.name = ANY(%(names)s::TEXT[]) OR p.player_id = ANY(%(ids)s::INT[])
+ORDER BY p.name, pr.ranking_date ASC;
+"""
+
+# Each match is read once from the winner's side and once from the loser's, so the selected
+# players are hash joined against a single pass over matches whatever their number
+ODDS_BATCH = """
+WITH selected AS (
+  SELECT player_id, name FROM players
+  WHERE name = ANY(%(names)s::TEXT[]) OR player_id = ANY(%(ids)s::INT[])
+),
+sides AS (
+  SELECT match_id, date, winner_id AS player_id, loser_id AS opponent_id, 'Won' AS result FROM matches
+  UNION ALL
+  SELECT match_id, date, loser_id, winner_id, 'Lost' FROM matches
+)
+SELECT
+    s.name AS player,
+    sd.match_id,
+    sd.date AS match_date,
+    sd.result,
+    o.name AS opponent,
+    bo.winner_odds AS winner_odds,
+    bo.loser_odds AS loser_odds
+FROM selected s
+JOIN sides sd ON sd.player_id = s.player_id
+LEFT JOIN players o ON o.player_id = sd.opponent_id
+LEFT JOIN betting_odds bo ON bo.match_id = sd.match_id
+ORDER BY s.name, sd.match_id;
+"""
+
 ALL_MATCHES_QUERY = """
 SELECT 
   TO_CHAR(m.date, 'DD-MM-YYYY') AS match_date,
@@ -265,6 +850,41 @@ JOIN
 ORDER BY m.date DESC
 """
 
+# One page of matches, newest first. Every filter is skipped when its parameter is NULL,
+# and the page starts after the (date, match_id) of the last row of the previous one.
+ALL_MATCHES_PAGE_QUERY = """
+SELECT
+  m.match_id,
+  m.date,
+  TO_CHAR(m.date, 'DD-MM-YYYY') AS match_date,
+  tr.surface AS surface,
+  tr.court AS court_type,
+  tr.name AS tournament_name,
+  m.round AS match_round,
+  p_winner.name AS winner_player,
+  m.winner_sets AS winner_sets,
+  p_loser.name AS loser_player,
+  m.loser_sets AS loser_sets,
+  m.comments
+FROM matches m
+JOIN
+  tournaments tr ON m.tournament_id = tr.tournament_id
+JOIN
+  players p_winner ON m.winner_id = p_winner.player_id
+JOIN
+  players p_loser ON m.loser_id = p_loser.player_id
+WHERE
+  (%(surface)s::TEXT IS NULL OR tr.surface = %(surface)s)
+  AND (%(court)s::TEXT IS NULL OR tr.court = %(court)s)
+  AND (%(tournament)s::TEXT IS NULL OR tr.name = %(tournament)s)
+  AND (%(player)s::TEXT IS NULL OR %(player)s IN (p_winner.name, p_loser.name))
+  AND (%(date_from)s::DATE IS NULL OR m.date >= %(date_from)s)
+  AND (%(date_to)s::DATE IS NULL OR m.date <= %(date_to)s)
+  AND (%(after_date)s::DATE IS NULL OR (m.date, m.match_id) < (%(after_date)s, %(after_match_id)s))
+ORDER BY m.date DESC, m.match_id DESC
+LIMIT %(limit)s
+"""
+
 ODDS = """
 SELECT 
     m.match_id,
@@ -289,6 +909,37 @@ WHERE
     p.name = (%s);  
 """
 
+# Leaderboard of the players page, in the shape of the simulation summary merged with `players`
+LEADERBOARD_QUERY = """
+SELECT
+    p.*,
+    p.name AS "Player",
+    l.num_wins AS "Number of Bet Won",
+    l.num_losses AS "Number of Bet Lost",
+    l.win_percentage AS "Win Percentage (%)",
+    l.final_amount AS "Final Amount (€)",
+    l.net_gain_loss AS "Net Gain/Loss (€)",
+    l.net_gain_loss_percentage AS "Net Gain/Loss Percentage (%)",
+    l.num_played_games AS "Number of Played Games",
+    l.net_gain_loss_ci_low AS "Net Gain/Loss CI Low (€)",
+    l.net_gain_loss_ci_high AS "Net Gain/Loss CI High (€)",
+    l.net_gain_loss_percentage_ci_low AS "Net Gain/Loss Percentage CI Low (%)",
+    l.net_gain_loss_percentage_ci_high AS "Net Gain/Loss Percentage CI High (%)",
+    l.win_percentage_ci_low AS "Win Percentage CI Low (%)",
+    l.win_percentage_ci_high AS "Win Percentage CI High (%)",
+    l.probability_of_profit AS "Probability of Profit (%)",
+    l.amount_rank,
+    l.country,
+    l.flag,
+    l.picture_url
+FROM
+    simulation_leaderboard l
+JOIN
+    players p ON p.player_id = l.player_id
+ORDER BY
+    l.amount_rank, l.player_id;
+"""
+
 DATA_TO_SIMULATE = """
 SELECT
     m.*,
@@ -305,3 +956,51 @@ JOIN
 LEFT JOIN
     betting_odds bo ON m.match_id = bo.match_id AND bo.bookmaker = 'Avg'
 """
+
+# In chronological order, so running totals and drawdowns don't depend on the physical row order
+DATA_TO_SIMULATE_ORDERED = DATA_TO_SIMULATE + """ORDER BY m.date, m.match_id
+"""
+
+# Every match played by the player named %(player)s, in chronological order
+DATA_TO_SIMULATE_FOR_PLAYER_NAME = DATA_TO_SIMULATE + """WHERE p_winner.name = %(player)s OR p_loser.name = %(player)s
+ORDER BY m.date, m.match_id
+"""
+
+# Every match played by one of the players named in %(players)s, in chronological order
+DATA_TO_SIMULATE_FOR_PLAYERS = DATA_TO_SIMULATE + """WHERE p_winner.name = ANY(%(players)s) OR p_loser.name = ANY(%(players)s)
+ORDER BY m.date, m.match_id
+"""
+
+# Matches whose row or average odds were inserted or updated since %(since)s
+DATA_TO_SIMULATE_CHANGED = DATA_TO_SIMULATE + """WHERE m.updated_at >= %(since)s OR bo.updated_at >= %(since)s
+ORDER BY m.date, m.match_id
+"""
+
+# Every match with the odds of all bookmakers side by side, one pair of columns per bookmaker
+DATA_TO_SIMULATE_ALL_BOOKMAKERS = """
+SELECT
+    m.match_id,
+    m.date,
+    p_winner.name AS "Winner",
+    p_loser.name AS "Loser",
+    MAX(bo.winner_odds) FILTER (WHERE bo.bookmaker = 'Bet365') AS "B365W",
+    MAX(bo.loser_odds) FILTER (WHERE bo.bookmaker = 'Bet365') AS "B365L",
+    MAX(bo.winner_odds) FILTER (WHERE bo.bookmaker = 'Pinnacle') AS "PSW",
+    MAX(bo.loser_odds) FILTER (WHERE bo.bookmaker = 'Pinnacle') AS "PSL",
+    MAX(bo.winner_odds) FILTER (WHERE bo.bookmaker = 'Max') AS "MaxW",
+    MAX(bo.loser_odds) FILTER (WHERE bo.bookmaker = 'Max') AS "MaxL",
+    MAX(bo.winner_odds) FILTER (WHERE bo.bookmaker = 'Avg') AS "AvgW",
+    MAX(bo.loser_odds) FILTER (WHERE bo.bookmaker = 'Avg') AS "AvgL"
+FROM
+    matches m
+JOIN
+    players p_winner ON m.winner_id = p_winner.player_id
+JOIN
+    players p_loser ON m.loser_id = p_loser.player_id
+LEFT JOIN
+    betting_odds bo ON m.match_id = bo.match_id
+GROUP BY
+    m.match_id, p_winner.name, p_loser.name
+ORDER BY
+    m.date, m.match_id
+"""
@@ -0,0 +1,110 @@
+"""
+Bootstrap confidence intervals for the per-player outcome of a betting simulation.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config import MAX_BOOTSTRAP_RESAMPLES
+from src.simulator import settle_matches, player_bets
+from src.strategies import bet_on_smaller_odd
+
+# Upper bound on the resampled bets drawn at once, to keep memory flat
+MAX_DRAWS_PER_CHUNK = 4_000_000
+
+
+def resample_player_totals(net_result: np.ndarray, counts: np.ndarray, wins: np.ndarray,
+                           n_resamples: int, seed=None):
+    """
+    Resample every player's bet sequence with replacement `n_resamples` times.
+
+    `net_result` holds the bets grouped by player, `counts[p]` bets for player
+    p of which the first `wins[p]` are the bets won. Returns two
+    (n_resamples, n_players) matrices with the net gain and the number of
+    bets won of every resample.
+    """
+    rng = np.random.default_rng(seed)
+    n_players = len(counts)
+    active = np.flatnonzero(counts)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Bet slots of one resample: the owning player's first bet, bets and bets won
+    slot_players = np.repeat(active, counts[active])
+    slot_offsets = offsets[slot_players].astype(np.int32)
+    slot_counts = counts[slot_players].astype(np.float32)
+    slot_wins = wins[slot_players].astype(np.float32)
+    starts = np.searchsorted(slot_players, active)
+
+    net_gain = np.zeros((n_resamples, n_players))
+    num_wins = np.zeros((n_resamples, n_players), dtype=np.int64)
+    if not len(slot_players):
+        return net_gain, num_wins
+
+    chunk = max(1, MAX_DRAWS_PER_CHUNK // len(slot_players))
+    for first in range(0, n_resamples, chunk):
+        rows = min(chunk, n_resamples - first)
+        # Single precision positions and indices halve the memory traffic of the hot loop
+        positions = rng.random((rows, len(slot_players)), dtype=np.float32)
+        positions *= slot_counts
+        # Won bets come first within a player, so a draw is a win below the number of wins
+        num_wins[first:first + rows, active] = np.add.reduceat(positions < slot_wins, starts,
+                                                               axis=1, dtype=np.int32)
+        draws = positions.astype(np.int32)
+        draws += slot_offsets
+        net_gain[first:first + rows, active] = np.add.reduceat(net_result[draws], starts, axis=1)
+    return net_gain, num_wins
+
+
+def _resample_job(args):
+    return resample_player_totals(*args)
+
+
+def bootstrap_by_player(df, initial_value, bet_amount, strategy=bet_on_smaller_odd,
+                        n_resamples: int = 10_000, confidence: float = 0.95,
+                        seed: Optional[int] = None, workers: int = 1) -> pd.DataFrame:
+    """
+    Confidence intervals for each player's net gain and win rate, by bootstrap.
+
+    Each player's bets are resampled with replacement, as a whole matrix of
+    resamples at a time. With `workers` > 1 the resamples are split across
+    processes, each with its own independent random stream. `n_resamples` is
+    capped at `MAX_BOOTSTRAP_RESAMPLES`. Players are returned in the order of
+    `src.simulator.simulate_by_player`.
+    """
+    n_resamples = max(1, min(int(n_resamples), MAX_BOOTSTRAP_RESAMPLES))
+    players, codes, won, net_result = player_bets(df, settle_matches(df, bet_amount, strategy))
+    counts = np.bincount(codes, minlength=len(players))
+    wins = np.bincount(codes, weights=won, minlength=len(players)).astype(np.int64)
+
+    # Group the bets by player, the bets won first
+    net_result = net_result[np.lexsort((~won, codes))]
+
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    shares = np.diff(np.linspace(0, n_resamples, workers + 1).astype(int))
+    jobs = [(net_result, counts, wins, share, child) for share, child in zip(shares, seeds)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_resample_job, jobs))
+    else:
+        results = [_resample_job(job) for job in jobs]
+    net_gain = np.concatenate([result[0] for result in results])
+    num_wins = np.concatenate([result[1] for result in results])
+
+    tail = (1 - confidence) / 2 * 100
+    net_low, net_high = np.percentile(net_gain, [tail, 100 - tail], axis=0)
+    win_rate = np.divide(num_wins * 100, counts, out=np.zeros(num_wins.shape), where=counts > 0)
+    win_low, win_high = np.percentile(win_rate, [tail, 100 - tail], axis=0)
+
+    return pd.DataFrame({
+        "Player": players,
+        "Net Gain/Loss CI Low (€)": np.round(net_low, 2),
+        "Net Gain/Loss CI High (€)": np.round(net_high, 2),
+        "Net Gain/Loss Percentage CI Low (%)": np.round(net_low / initial_value * 100, 2),
+        "Net Gain/Loss Percentage CI High (%)": np.round(net_high / initial_value * 100, 2),
+        "Win Percentage CI Low (%)": np.round(win_low, 2),
+        "Win Percentage CI High (%)": np.round(win_high, 2),
+        "Probability of Profit (%)": np.round((net_gain > 0).mean(axis=0) * 100, 2),
+    })
@@ -5,10 +5,9 @@ Enriches the data by handling additional extractions and data transformations.
 import sys
 import os
 import pandas as pd
-import psycopg2
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from db_values import HOST, DBNAME, USER, PASSWORD
+from aux import pooled_connection, bump_data_version
 from src.utils import extract_atp_players_data, append_player_info
 
 class DataEnricher:
@@ -19,11 +18,10 @@ class DataEnricher:
 
     def enrich_data(self):
         """INSERT external data into the main database."""
-        with psycopg2.connect(
-            host=HOST, dbname=DBNAME, user=USER, password=PASSWORD
-        ) as conn:
+        with pooled_connection() as conn:
             with conn.cursor() as cur:
                 append_player_info(self.atp_players_info, cur)
+                bump_data_version(cur)
 
     def get_atp_players_data(self, online: bool = False) -> pd.DataFrame:
         """Loads data either offline using cached dataframe or webscrapping offical ATP Ranking
@@ -3,19 +3,11 @@ Exports the data from postgres into a master table.
 """
 
 import os
+import sys
 import pandas as pd
-import psycopg2
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
-DB_CONFIG = {
-    'host': os.getenv('HOST'),
-    'dbname': os.getenv('DBNAME'),
-    'user': os.getenv('USER'),
-    'password': os.getenv('PASSWORD'),
-}   
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aux import pooled_connection
 
 QUERY = """
     WITH set_scores AS (
@@ -88,8 +80,8 @@ QUERY = """
 def create_master_data(output_dir: str = "data/output", query: str = QUERY) -> None:
     """Export the master data from the database into a CSV file."""    
     try:
-        # Connect to the database
-        with psycopg2.connect(**DB_CONFIG) as conn:
+        # Borrow a connection from the shared pool
+        with pooled_connection() as conn:
             # Execute query and load ito DataFrame
             df = pd.read_sql(query, conn)
 
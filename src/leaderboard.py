@@ -0,0 +1,128 @@
+"""
+Refreshes the simulation leaderboard of the players page, to run after every ETL.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+import pandas as pd
+import psycopg2
+from psycopg2.extensions import cursor
+from psycopg2.extras import execute_values
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aux import convert_nan_to_none, bump_data_version
+from config import SIMULATION_INITIAL_VALUE, SIMULATION_BET_AMOUNT, LEADERBOARD_RESAMPLES, MAX_BOOTSTRAP_RESAMPLES
+from db_values import HOST, DBNAME, USER, PASSWORD
+from sql_queries import (
+    DATA_TO_SIMULATE_ORDERED, DATA_TO_SIMULATE_FOR_PLAYERS, LEADERBOARD_DELETE, LEADERBOARD_INSERT,
+    LEADERBOARD_INTERVALS_SELECT
+)
+from src.bootstrap import bootstrap_by_player
+from src.simulation_state import sync_simulation_state, state_summary
+from src.strategies import bet_on_smaller_odd
+from src.visual_addons import process_nationality_and_atp_code
+
+# Leaderboard columns, in the order of LEADERBOARD_INSERT
+LEADERBOARD_COLUMNS = [
+    "player_id", "amount_rank", "Number of Bet Won", "Number of Bet Lost", "Win Percentage (%)",
+    "Final Amount (€)", "Net Gain/Loss (€)", "Net Gain/Loss Percentage (%)", "Number of Played Games",
+    "Net Gain/Loss CI Low (€)", "Net Gain/Loss CI High (€)", "Net Gain/Loss Percentage CI Low (%)",
+    "Net Gain/Loss Percentage CI High (%)", "Win Percentage CI Low (%)", "Win Percentage CI High (%)",
+    "Probability of Profit (%)", "country", "flag", "picture_url",
+]
+
+
+def select_frame(cur: cursor, query: str) -> pd.DataFrame:
+    """Run `query` and return its rows as a DataFrame."""
+    cur.execute(query)
+    return pd.DataFrame(cur.fetchall(), columns=[column.name for column in cur.description])
+
+
+def refresh_intervals(cur: cursor, players: pd.Series, changed: Optional[List[str]], initial_value, bet_amount,
+                      strategy, n_resamples: int) -> pd.DataFrame:
+    """
+    Bootstrap confidence intervals of `players`, reusing the stored ones of the players whose matches didn't change.
+
+    The players in `changed` (None: every player), and those without stored
+    intervals, are resampled again over all of their matches.
+    """
+    stored = select_frame(cur, LEADERBOARD_INTERVALS_SELECT)
+    if changed is not None:
+        stored = stored[~stored["Player"].isin(changed)]
+        changed = sorted(set(changed) | set(players[~players.isin(stored["Player"])]))
+    if changed == []:
+        return stored
+
+    if changed is None:
+        df = select_frame(cur, DATA_TO_SIMULATE_ORDERED)
+    else:
+        cur.execute(DATA_TO_SIMULATE_FOR_PLAYERS, {"players": changed})
+        df = pd.DataFrame(cur.fetchall(), columns=[column.name for column in cur.description])
+    fresh = bootstrap_by_player(df, initial_value, bet_amount, strategy, n_resamples=n_resamples)
+    if changed is None:
+        return fresh
+    # Their opponents were only loaded for the shared matches
+    fresh = fresh[fresh["Player"].isin(changed)]
+    return pd.concat([fresh, stored[~stored["Player"].isin(fresh["Player"])]], ignore_index=True)
+
+
+def refresh_leaderboard(cur: cursor, initial_value=SIMULATION_INITIAL_VALUE, bet_amount=SIMULATION_BET_AMOUNT,
+                        strategy=bet_on_smaller_odd, n_resamples: int = LEADERBOARD_RESAMPLES,
+                        recompute: bool = False) -> int:
+    """
+    Recompute the simulation leaderboard and replace the stored one.
+
+    The per-player summary comes from the incremental simulation state, so
+    only matches loaded or updated since the last refresh are settled, and
+    only the players of those matches are bootstrapped again; the others keep
+    their stored intervals, which were computed from the same bets as their
+    unchanged totals. Readers keep seeing the previous leaderboard until the
+    transaction commits. Returns the number of players ranked.
+    """
+    key, changed = sync_simulation_state(cur, initial_value, bet_amount, strategy, recompute=recompute)
+    summary = state_summary(cur, key, initial_value)
+    if n_resamples:
+        intervals = refresh_intervals(cur, summary["Player"], changed, initial_value, bet_amount, strategy,
+                                      n_resamples)
+        summary = summary.merge(intervals, on="Player", how="left")
+    summary["amount_rank"] = summary["Net Gain/Loss (€)"].rank(method="dense", ascending=False).astype(int)
+
+    # Players info, which only exists once the data enricher has run
+    players = select_frame(cur, "SELECT * FROM players")
+    for column in ("nationality", "atp_code"):
+        if column not in players.columns:
+            players[column] = None
+    leaderboard = process_nationality_and_atp_code(summary.merge(players, left_on="Player", right_on="name"))
+    leaderboard = leaderboard.reindex(columns=LEADERBOARD_COLUMNS)
+
+    rows = [tuple(convert_nan_to_none(value) for value in row)
+            for row in leaderboard.astype(object).itertuples(index=False)]
+    cur.execute(LEADERBOARD_DELETE)
+    execute_values(cur, LEADERBOARD_INSERT, rows)
+    # The leaderboard is served with the data version as ETag, so clients must see it change
+    bump_data_version(cur)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the simulation leaderboard.")
+    parser.add_argument("--resamples", type=int, default=LEADERBOARD_RESAMPLES,
+                        help=f"Bootstrap resamples for the confidence intervals (0 to skip them, "
+                             f"at most {MAX_BOOTSTRAP_RESAMPLES}).")
+    parser.add_argument("--recompute", action="store_true",
+                        help="Replay every match and resample every player instead of only what changed.")
+    args = parser.parse_args()
+    if not 0 <= args.resamples <= MAX_BOOTSTRAP_RESAMPLES:
+        parser.error(f"--resamples must be between 0 and {MAX_BOOTSTRAP_RESAMPLES}")
+
+    with psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD) as conn:
+        with conn.cursor() as cur:
+            n_players = refresh_leaderboard(cur, n_resamples=args.resamples, recompute=args.recompute)
+    print(f"Leaderboard refreshed with {n_players} players.")
+
+
+if __name__ == "__main__":
+    main()
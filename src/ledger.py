@@ -0,0 +1,126 @@
+"""
+Compact, columnar ledger of the bets placed by a simulation.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.simulator import BetResult, settle_matches, NON_INTERESTING_COLUMNS
+from src.strategies import bet_on_smaller_odd, PICK_A
+
+
+class BetLedger(NamedTuple):
+    """
+    One entry per placed bet, in match order, as typed arrays.
+
+    Players are int32 codes into `players`, results are int8 `BetResult`
+    values and amounts are float32, about 22 bytes per bet. Running totals
+    are accumulated in double precision on demand.
+    """
+
+    match_ids: np.ndarray
+    winner_ids: np.ndarray
+    loser_ids: np.ndarray
+    picks: np.ndarray
+    results: np.ndarray
+    odds: np.ndarray
+    net_result: np.ndarray
+    players: pd.Index
+    initial_value: float
+    bet_amount: float
+
+    @property
+    def num_bets(self) -> int:
+        return len(self.match_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the per-bet arrays."""
+        return sum(getattr(self, field).nbytes for field in
+                   ("match_ids", "winner_ids", "loser_ids", "picks", "results", "odds", "net_result"))
+
+    def running_total(self) -> np.ndarray:
+        """Bankroll after each bet."""
+        return self.initial_value + np.cumsum(self.net_result, dtype=np.float64)
+
+    def take(self, positions) -> "BetLedger":
+        """Ledger of the bets at `positions` (indices or boolean mask), in order."""
+        return self._replace(**{field: getattr(self, field)[positions] for field in
+                                ("match_ids", "winner_ids", "loser_ids", "picks", "results", "odds", "net_result")})
+
+    def for_player(self, player: str) -> "BetLedger":
+        """Bets on the matches played by `player`, whose running total is then that player's bankroll."""
+        if player not in self.players:
+            return self.take(np.zeros(self.num_bets, dtype=bool))
+        code = self.players.get_loc(player)
+        return self.take((self.winner_ids == code) | (self.loser_ids == code))
+
+    def for_matches(self, match_ids) -> "BetLedger":
+        """Bets on the matches with the given ids."""
+        return self.take(np.isin(self.match_ids, match_ids))
+
+    def to_frame(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Readable view of the ledger, one row per bet.
+
+        Odds and amounts are rounded to the cent, as `src.simulator.simulate_bets`
+        shows them, rather than exposing their float32 storage. With the source frame `df` of the simulation, the columns of the
+        matches are added back, like `src.simulator.simulate_bets` returns them.
+        """
+        winners = self.players[self.winner_ids]
+        losers = self.players[self.loser_ids]
+        ledger = pd.DataFrame({
+            "match_id": self.match_ids,
+            "Winner": winners,
+            "Loser": losers,
+            "bet_decision": np.where(self.picks == PICK_A, winners, losers),
+            "odds": np.round(self.odds.astype(np.float64), 2),
+            "bet_result": np.where(self.results == BetResult.WIN.value, BetResult.WIN, BetResult.LOSE),
+            "netResult": np.round(self.net_result.astype(np.float64), 2),
+            "running_total": np.round(self.running_total(), 2),
+        })
+        if df is None:
+            return ledger
+
+        interesting_columns = [x for x in df.columns
+                               if x not in NON_INTERESTING_COLUMNS and x not in ledger.columns]
+        matches = df[interesting_columns].iloc[self._positions(df)].reset_index(drop=True)
+        return pd.concat([matches, ledger], axis=1)
+
+    def _positions(self, df: pd.DataFrame) -> np.ndarray:
+        """Rows of `df` the bets were placed on."""
+        if "match_id" in df.columns:
+            return pd.Index(df["match_id"]).get_indexer(self.match_ids)
+        return self.match_ids
+
+
+def simulate_ledger(df, initial_value, bet_amount, strategy=bet_on_smaller_odd) -> BetLedger:
+    """
+    Simulate betting `bet_amount` on every match of `df` and keep the bets as a `BetLedger`.
+
+    Match ids are taken from the `match_id` column when present (as loaded by
+    DATA_TO_SIMULATE), else they are the positions of the rows in `df`.
+    """
+    settled = settle_matches(df, bet_amount, strategy)
+    placed = settled.placed
+
+    player_codes, players = pd.factorize(pd.concat([df["Winner"], df["Loser"]]))
+    n_matches = len(df)
+    winner_codes, loser_codes = player_codes[:n_matches], player_codes[n_matches:]
+    match_ids = df["match_id"].to_numpy() if "match_id" in df.columns else np.arange(n_matches)
+
+    picks = settled.picks[placed]
+    return BetLedger(
+        match_ids=match_ids[placed].astype(np.int32),
+        winner_ids=winner_codes[placed].astype(np.int32),
+        loser_ids=loser_codes[placed].astype(np.int32),
+        picks=picks,
+        results=np.where(settled.won[placed], BetResult.WIN.value, BetResult.LOSE.value).astype(np.int8),
+        odds=np.where(picks == PICK_A, settled.odds_w[placed], settled.odds_l[placed]).astype(np.float32),
+        net_result=settled.net_result[placed].astype(np.float32),
+        players=players,
+        initial_value=float(initial_value),
+        bet_amount=float(bet_amount),
+    )
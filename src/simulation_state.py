@@ -0,0 +1,148 @@
+"""
+Keeps the per-player outcome of a betting simulation in the database and settles only the matches that changed.
+"""
+
+import functools
+import hashlib
+import inspect
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from psycopg2.extensions import cursor
+from psycopg2.extras import execute_values
+
+from sql_queries import (
+    DATA_TO_SIMULATE_ORDERED, DATA_TO_SIMULATE_CHANGED, SIMULATION_RUN_INSERT, SIMULATION_RUN_LOCK,
+    SIMULATION_RUN_UPDATE, SIMULATION_STALE_RUNS_DELETE, SIMULATION_STATE_DELETE, SIMULATION_STATE_EMPTY_DELETE,
+    SIMULATION_STATE_UPSERT, SIMULATION_STATE_SELECT, SIMULATION_WATERMARK_SELECT, SIMULATION_BETS_DELETE,
+    SIMULATION_BETS_INSERT, SIMULATION_BETS_TAKE_BACK
+)
+from src.simulator import settle_matches, summarise_players
+from src.strategies import as_array_strategy, bet_on_smaller_odd
+
+
+def strategy_name(strategy) -> str:
+    """Qualified name of a strategy, looking through `functools.partial`."""
+    func = strategy.func if isinstance(strategy, functools.partial) else strategy
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _source(func) -> str:
+    """Source code of a function, looking through `functools.partial`, or "" if it isn't available."""
+    func = func.func if isinstance(func, functools.partial) else func
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return ""
+
+
+def strategy_key(strategy, initial_value, bet_amount) -> str:
+    """
+    Fingerprint of a strategy, its parameters and the stakes.
+
+    The source of the code that is actually run is part of the key: the
+    strategy, the array strategy it is executed as (see
+    `src.strategies.as_array_strategy`) and `settle_matches`. Editing any of
+    them (e.g. an odds floor) starts a new state instead of reusing the old one.
+    """
+    executed = as_array_strategy(strategy)
+    sources = [_source(func) for func in (strategy, executed, settle_matches)]
+    bound = (strategy.args, sorted(strategy.keywords.items())) if isinstance(strategy, functools.partial) else ()
+    fingerprint = repr((strategy_name(strategy), strategy_name(executed), sources, bound,
+                        float(initial_value), float(bet_amount)))
+    return hashlib.sha1(fingerprint.encode()).hexdigest()
+
+
+def settle_changed_matches(cur: cursor, key: str, bet_amount, strategy, since=None) -> Optional[List[str]]:
+    """
+    Settle the matches updated since `since` and apply them to the state of `key`.
+
+    A match counts as updated when its row or its average odds were inserted
+    or updated in place. Every bet is kept in `simulation_bets`, so the old
+    bet on a match updated in place is taken back from both players' totals
+    before its new settlement is added. With `since` None the state is
+    rebuilt from every match.
+
+    Returns the names of the players whose matches changed, or None after a
+    rebuild.
+    """
+    if since is None:
+        cur.execute(SIMULATION_STATE_DELETE, (key,))
+        cur.execute(SIMULATION_BETS_DELETE, (key,))
+        cur.execute(DATA_TO_SIMULATE_ORDERED)
+    else:
+        cur.execute(DATA_TO_SIMULATE_CHANGED, {"since": since})
+    df = pd.DataFrame(cur.fetchall(), columns=[column.name for column in cur.description])
+    if df.empty:
+        return None if since is None else []
+    if since is not None:
+        cur.execute(SIMULATION_BETS_TAKE_BACK, {"key": key, "match_ids": df["match_id"].tolist()})
+
+    settled = settle_matches(df, bet_amount, strategy)
+    placed = settled.placed
+    winner_ids, loser_ids = df["winner_id"].to_numpy()[placed], df["loser_id"].to_numpy()[placed]
+    won, net_result = settled.won[placed], settled.net_result[placed]
+    bets = zip([key] * int(placed.sum()), df["match_id"].to_numpy()[placed].tolist(), winner_ids.tolist(),
+               loser_ids.tolist(), won.tolist(), net_result.tolist())
+    execute_values(cur, SIMULATION_BETS_INSERT, list(bets))
+
+    players, codes = np.unique(np.concatenate([winner_ids, loser_ids]), return_inverse=True)
+    num_played_games = np.bincount(codes, minlength=len(players))
+    num_wins = np.bincount(codes, weights=np.concatenate([won, won]), minlength=len(players)).astype(np.int64)
+    net_sum = np.bincount(codes, weights=np.concatenate([net_result, net_result]), minlength=len(players))
+    rows = zip([key] * len(players), players.tolist(), net_sum.tolist(), num_wins.tolist(),
+               (num_played_games - num_wins).tolist())
+    execute_values(cur, SIMULATION_STATE_UPSERT, list(rows))
+    cur.execute(SIMULATION_STATE_EMPTY_DELETE, (key,))
+
+    if since is None:
+        return None
+    return pd.unique(pd.concat([df["Winner"], df["Loser"]])).tolist()
+
+
+def sync_simulation_state(cur: cursor, initial_value, bet_amount, strategy=bet_on_smaller_odd,
+                          recompute: bool = False) -> Tuple[str, Optional[List[str]]]:
+    """
+    Bring the stored simulation of `strategy` up to date with the loaded matches.
+
+    Only the matches loaded or updated since the last call are settled. A new
+    strategy, new strategy parameters or `recompute` start again from the
+    first match. Returns the key of the simulation and the names of the
+    players whose totals may have changed (None: all of them).
+    """
+    key = strategy_key(strategy, initial_value, bet_amount)
+    name = strategy_name(strategy)
+    cur.execute(SIMULATION_STALE_RUNS_DELETE, (name, initial_value, bet_amount, key))
+    cur.execute(SIMULATION_RUN_INSERT, (key, name, initial_value, bet_amount))
+
+    # Lock the run so concurrent callers don't settle the same matches twice
+    cur.execute(SIMULATION_RUN_LOCK, (key,))
+    synced_at = cur.fetchone()[0]
+    # Taken before reading the changes, so rows of transactions still open now are read again next time
+    cur.execute(SIMULATION_WATERMARK_SELECT)
+    watermark = cur.fetchone()[0]
+
+    changed = settle_changed_matches(cur, key, bet_amount, strategy, since=None if recompute else synced_at)
+    cur.execute(SIMULATION_RUN_UPDATE, (watermark, key))
+    return key, changed
+
+
+def state_summary(cur: cursor, key: str, initial_value) -> pd.DataFrame:
+    """Per-player summary of the stored simulation `key`, like `src.simulator.simulate_by_player`."""
+    cur.execute(SIMULATION_STATE_SELECT, (key,))
+    state = pd.DataFrame(cur.fetchall(), columns=["Player", "num_wins", "num_losses", "running_total"])
+    return summarise_players(state["Player"], state["num_wins"], state["num_wins"] + state["num_losses"],
+                             state["running_total"], initial_value)
+
+
+def simulate_by_player_incremental(cur: cursor, initial_value, bet_amount, strategy=bet_on_smaller_odd,
+                                   recompute: bool = False) -> pd.DataFrame:
+    """
+    Per-player simulation summary, like `src.simulator.simulate_by_player`, kept up to date in the database.
+
+    See `sync_simulation_state`: the cost is linear in the number of matches
+    loaded or updated since the last call.
+    """
+    key, _ = sync_simulation_state(cur, initial_value, bet_amount, strategy, recompute=recompute)
+    return state_summary(cur, key, initial_value)
@@ -1,6 +1,14 @@
+import numpy as np
 import pandas as pd
 from enum import Enum, auto
-from src.strategies import bet_on_smaller_odd
+from typing import NamedTuple
+from src.strategies import bet_on_smaller_odd, as_array_strategy, PICK_A, NO_BET
+
+# Source columns left out of the simulation results
+NON_INTERESTING_COLUMNS = ('ATP', 'Location', 'Tournament','Series', 'Court', 'Surface',
+       'Best of', 'WRank', 'LRank', 'WPts', 'LPts',
+       'W1', 'L1', 'W2', 'L2', 'W3', 'L3', 'W4', 'L4', 'W5', 'L5', 'Wsets',
+       'Lsets', 'Comment', 'B365W', 'B365L', 'PSW', 'PSL', 'MaxW', 'MaxL')
 
 class BetResult(Enum):
     """Result of the bet"""
@@ -19,97 +27,201 @@ def settleBet(bet_result: BetResult, bet_amount: float, winner_odd: float) -> fl
         return (bet_amount * winner_odd) - bet_amount
     else:
         return - bet_amount
-    
-def simulate_bets(df, initial_value, bet_amount, strategy=bet_on_smaller_odd):
-    results = list()
-    running_total = initial_value
-    df.loc[:, 'AvgW'] = df['AvgW'].astype(float)
-    df.loc[:, 'AvgL'] = df['AvgL'].astype(float)
 
+class SettledMatches(NamedTuple):
+    """Bet decision and settlement of every match of a frame, as arrays aligned with its rows."""
+
+    odds_w: np.ndarray
+    odds_l: np.ndarray
+    picks: np.ndarray
+    placed: np.ndarray
+    won: np.ndarray
+    net_result: np.ndarray
+
+def settle_matches(df, bet_amount, strategy=bet_on_smaller_odd) -> SettledMatches:
+    """
+    Decide and settle a bet of `bet_amount` on every match of `df` at once.
+
+    `strategy` may be an array strategy or a legacy scalar one (see
+    `src.strategies.as_array_strategy`); player A is the winner of the match.
+    Matches without odds (missing or zero) or that the strategy skips are not
+    placed; `won` and `net_result` are only meaningful where `placed` is True.
+    """
+    odds_w = df['AvgW'].astype(float).to_numpy()
+    odds_l = df['AvgL'].astype(float).to_numpy()
+    # Matches with a zero price are skipped, a missing (NaN) price is left to the strategy
+    has_odds = (odds_w != 0) & (odds_l != 0)
+    n_without_odds = int((~has_odds).sum())
+    if n_without_odds:
+        print(f"Skipping {n_without_odds} games due to missing odds (AvgW or AvgL)")
+
+    picks = np.full(len(df), NO_BET, dtype=np.int8)
+    features = df if has_odds.all() else df[has_odds]
+    picks[has_odds] = as_array_strategy(strategy)(odds_w[has_odds], odds_l[has_odds], features)
+    placed = picks != NO_BET
+
+    won = picks == PICK_A
+    net_result = np.where(won, (bet_amount * odds_w) - bet_amount, -bet_amount)
+    return SettledMatches(odds_w, odds_l, picks, placed, won, net_result)
 
-    for _, match in df.iterrows():
-        #print(f"{match["Winner"] = }")
-        intersting_columns = [x for x in df.columns if x not in ('ATP', 'Location', 'Tournament','Series', 'Court', 'Surface',
-       'Best of', 'WRank', 'LRank', 'WPts', 'LPts',
-       'W1', 'L1', 'W2', 'L2', 'W3', 'L3', 'W4', 'L4', 'W5', 'L5', 'Wsets',
-       'Lsets', 'Comment', 'B365W', 'B365L', 'PSW', 'PSL', 'MaxW', 'MaxL')]
-        match_dict = {col: match[col] for col in intersting_columns}
-
-        # Check if AvgW and AvgL are valid numbers (not None or 0)
-        if not match.get("AvgW") or not match.get("AvgL"):
-            print(f"Skipping game {match["Winner"]} - {match["Loser"]} due to missing odds (AvgW: {match.get('AvgW')}, AvgL: {match.get('AvgL')})")
-            continue
-
-        # Bet Decision (The one I think will win)
-        #print(match["Winner"], match["Loser"], match["AvgW"], match["AvgL"])
-        #print(type(match["AvgW"]))
-        bet_decision = strategy(match["Winner"], match["Loser"], match["AvgW"], match["AvgL"])
-        #print(f"{bet_decision = }")
-        if not bet_decision:
-            #print(f"Skipping for {match_dict}")
-            continue
-
-
-        # Evaluate Bet
-        bet_result = evaluate_bet(winner=match["Winner"], bet_decision=bet_decision)
-        #print(f"{bet_result = }") 
-
-        # Settling
-        netResult = settleBet(bet_result= bet_result, bet_amount= bet_amount, winner_odd= match["AvgW"])
-        #print(f"{match["AvgW"] = }")
-        #print(f"{match["AvgL"] = }")
-        #print(f"{netResult = }")
-
-        # Add new values to the dictionary
-        match_dict['bet_decision'] = bet_decision
-        match_dict['bet_result'] = bet_result
-        match_dict['netResult'] = netResult
-        running_total += netResult
-        match_dict['running_total'] = running_total
-
-        results.append(match_dict)
-        
-    return results
+def simulate_bets(df, initial_value, bet_amount, strategy=bet_on_smaller_odd):
+    """
+    Simulate betting `bet_amount` on every match of `df`, in order, with `strategy`.
+
+    Decisions, outcomes, net results and the running total are computed for the
+    whole frame at once. Matches without odds (missing or zero) or that the
+    strategy skips are left out. Returns one row per bet.
+    """
+    settled = settle_matches(df, bet_amount, strategy)
+    placed = settled.placed
+    net_result = settled.net_result[placed]
+    running_total = np.cumsum(np.concatenate(([initial_value], net_result)))[1:]
+
+    interesting_columns = [x for x in df.columns if x not in NON_INTERESTING_COLUMNS]
+    results = df.loc[placed, interesting_columns].copy()
+    results['AvgW'] = settled.odds_w[placed]
+    results['AvgL'] = settled.odds_l[placed]
+    results['bet_decision'] = results['Winner'].where(settled.won[placed], results['Loser'])
+    results['bet_result'] = np.where(settled.won[placed], BetResult.WIN, BetResult.LOSE)
+    results['netResult'] = net_result
+    results['running_total'] = running_total
+    return results.reset_index(drop=True)
+
+
+class PlayerBets(NamedTuple):
+    """Every placed bet seen from the side of each of its two players, in match order."""
+
+    players: pd.Index
+    codes: np.ndarray
+    won: np.ndarray
+    net_result: np.ndarray
+
+def player_bets(df, settled: SettledMatches) -> PlayerBets:
+    """Count each placed match of `df` once for its winner and once for its loser."""
+    # Players in order of first appearance, as winner first then as loser
+    player_codes, players = pd.factorize(pd.concat([df["Winner"], df["Loser"]]))
+    n_matches = len(df)
+    winner_codes, loser_codes = player_codes[:n_matches], player_codes[n_matches:]
+
+    placed = np.flatnonzero(settled.placed)
+    perspective_order = np.argsort(np.concatenate([placed, placed]), kind="stable")
+    codes = np.concatenate([winner_codes[placed], loser_codes[placed]])[perspective_order]
+    won = np.concatenate([settled.won[placed], settled.won[placed]])[perspective_order]
+    net_result = np.concatenate([settled.net_result[placed], settled.net_result[placed]])[perspective_order]
+    return PlayerBets(players, codes, won, net_result)
 
 
 def simulate_by_player(df, initial_value, bet_amount, strategy=bet_on_smaller_odd):
-    # Get All players
-    players = pd.concat([df["Winner"], df["Loser"]]).unique()
-
-    results_summary = []
-    for player in players:
-        #print(player)
-        # Create Player DataFrame
-        df_player = df[
-            (df["Winner"] == player) | (df["Loser"] == player)
-        ]
-        
-        # Simulates bets
-        res = simulate_bets(df_player, initial_value, bet_amount, strategy)
-        df_r = pd.DataFrame.from_dict(res)
-
-        # Generate Specific Columns
-        fraction_win = round(df_r["bet_result"].value_counts(normalize=True).get(BetResult.WIN, 0) * 100, 2)
-        final_amount = round(df_r.iloc[-1]["running_total"], 2)
-        net_gain_loss = round(final_amount - initial_value, 3)
-        net_gain_loss_percentage = round(net_gain_loss / initial_value * 100, 2)
-        
-        # Count wins and losses
-        num_wins = df_r["bet_result"].value_counts().get(BetResult.WIN, 0)
-        num_losses = df_r["bet_result"].value_counts().get(BetResult.LOSE, 0)
-
-        # Count the total number of games played
-        num_played_games = len(df_r)
-
-        # Append results to the summary list
-        results_summary.append({
-            "Player": player,
-            "Number of Bet Won": num_wins,
-            "Number of Bet Lost": num_losses,
-            "Win Percentage (%)": fraction_win,
-            "Final Amount (€)": final_amount,
-            "Net Gain/Loss (€)": net_gain_loss,
-            "Net Gain/Loss Percentage (%)": net_gain_loss_percentage,
-            "Number of Played Games": num_played_games
-        })
-    return pd.DataFrame(results_summary)
\ No newline at end of file
+    """
+    Simulate betting on the matches of every player and summarise the outcome per player.
+
+    A match is settled once and then counted for both of its players, in the
+    order of `df`, so the cost is linear in the number of matches. Each
+    player's bankroll starts at `initial_value`.
+    """
+    players, codes, won, net_result = player_bets(df, settle_matches(df, bet_amount, strategy))
+    n_players = len(players)
+
+    num_played_games = np.bincount(codes, minlength=n_players)
+    num_wins = np.bincount(codes, weights=won, minlength=n_players).astype(np.int64)
+
+    # Add each player's k-th bet to their bankroll at step k, so every bankroll
+    # sums its bets in match order, exactly like a running total
+    bet_ordinal = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+    by_ordinal = np.argsort(bet_ordinal, kind="stable")
+    steps = np.searchsorted(bet_ordinal[by_ordinal], np.arange(num_played_games.max(initial=0) + 1))
+    running_total = np.full(n_players, initial_value, dtype=float)
+    for start, end in zip(steps[:-1], steps[1:]):
+        step = by_ordinal[start:end]
+        running_total[codes[step]] += net_result[step]
+
+    return summarise_players(players, num_wins, num_played_games, running_total, initial_value)
+
+
+def summarise_players(players, num_wins, num_played_games, running_total, initial_value) -> pd.DataFrame:
+    """Per-player summary of a simulation from each player's bet counts and final bankroll."""
+    num_wins = np.asarray(num_wins, dtype=np.int64)
+    num_played_games = np.asarray(num_played_games, dtype=np.int64)
+    num_losses = num_played_games - num_wins
+    n_players = len(players)
+
+    fraction_win = np.round(np.divide(num_wins, num_played_games, out=np.zeros(n_players),
+                                      where=num_played_games > 0) * 100, 2)
+    final_amount = np.round(np.asarray(running_total, dtype=float), 2)
+    net_gain_loss = np.round(final_amount - initial_value, 3)
+    net_gain_loss_percentage = np.round(net_gain_loss / initial_value * 100, 2)
+
+    return pd.DataFrame({
+        "Player": players,
+        "Number of Bet Won": num_wins,
+        "Number of Bet Lost": num_losses,
+        "Win Percentage (%)": fraction_win,
+        "Final Amount (€)": final_amount,
+        "Net Gain/Loss (€)": net_gain_loss,
+        "Net Gain/Loss Percentage (%)": net_gain_loss_percentage,
+        "Number of Played Games": num_played_games,
+    })
+
+
+# Winner and loser odds of each bookmaker, named as in the source files and in DATA_TO_SIMULATE_ALL_BOOKMAKERS
+BOOKMAKER_ODDS_COLUMNS = {
+    "Bet365": ("B365W", "B365L"),
+    "Pinnacle": ("PSW", "PSL"),
+    "Max": ("MaxW", "MaxL"),
+    "Avg": ("AvgW", "AvgL"),
+}
+BEST_PRICE = "Best available price"
+
+def backtest_bookmakers(df, initial_value, bet_amount, strategy=bet_on_smaller_odd,
+                        bookmakers=BOOKMAKER_ODDS_COLUMNS) -> pd.DataFrame:
+    """
+    Simulate betting on every match of `df` at the prices of each bookmaker, and at the best price on offer.
+
+    The odds are loaded once into a matches x lines matrix; the strategy
+    decides a whole line per call and all lines are settled together. The
+    best available price line takes, for each player, the highest price of
+    any bookmaker. Returns one row per line.
+    """
+    odds_w = df[[winner for winner, _ in bookmakers.values()]].astype(float).to_numpy()
+    odds_l = df[[loser for _, loser in bookmakers.values()]].astype(float).to_numpy()
+    odds_w = np.column_stack([odds_w, np.fmax.reduce(odds_w, axis=1)])
+    odds_l = np.column_stack([odds_l, np.fmax.reduce(odds_l, axis=1)])
+    lines = [*bookmakers, BEST_PRICE]
+    n_matches, n_lines = odds_w.shape
+
+    # Matches with a zero price are skipped, a missing (NaN) price is left to the strategy
+    has_odds = (odds_w != 0) & (odds_l != 0)
+    picks = np.full((n_matches, n_lines), NO_BET, dtype=np.int8)
+    array_strategy = as_array_strategy(strategy)
+    for line in range(n_lines):
+        # Each call decides every match of a line, with the rows of `df` as features
+        line_has_odds = has_odds[:, line]
+        features = df if line_has_odds.all() else df[line_has_odds]
+        picks[line_has_odds, line] = array_strategy(odds_w[line_has_odds, line], odds_l[line_has_odds, line],
+                                                    features)
+    placed = picks != NO_BET
+    won = picks == PICK_A
+
+    net_result = np.where(won, (bet_amount * odds_w) - bet_amount, -bet_amount)
+    net_result[~placed] = 0
+    running_total = initial_value + np.cumsum(net_result, axis=0)
+    peak = np.fmax(np.maximum.accumulate(running_total, axis=0), initial_value)
+    max_drawdown = (peak - running_total).max(axis=0, initial=0)
+
+    num_bets = placed.sum(axis=0)
+    num_wins = (won & placed).sum(axis=0)
+    final_amount = np.round(running_total[-1] if n_matches else np.full(n_lines, float(initial_value)), 2)
+    net_gain_loss = np.round(final_amount - initial_value, 3)
+
+    return pd.DataFrame({
+        "Bookmaker": lines,
+        "Number of Bets": num_bets,
+        "Number of Bet Won": num_wins,
+        "Win Percentage (%)": np.round(np.divide(num_wins, num_bets, out=np.zeros(n_lines),
+                                                 where=num_bets > 0) * 100, 2),
+        "Final Amount (€)": final_amount,
+        "Net Gain/Loss (€)": net_gain_loss,
+        "Return on Stakes (%)": np.round(np.divide(net_gain_loss, num_bets * bet_amount, out=np.zeros(n_lines),
+                                                   where=num_bets > 0) * 100, 2),
+        "Max Drawdown (€)": np.round(max_drawdown, 2),
+    })
@@ -1,4 +1,30 @@
-from typing import Optional
+import functools
+from typing import Callable, Optional, Protocol
+
+import numpy as np
+import pandas as pd
+
+# Picks returned by array strategies
+PICK_A = 0
+PICK_B = 1
+NO_BET = -1
+
+class ArrayStrategy(Protocol):
+    """
+    Strategy deciding every match at once.
+
+    Receives the odds of player A and player B of every match, and optionally
+    the match rows as `features`, and returns one pick per match: PICK_A,
+    PICK_B or NO_BET.
+    """
+
+    def __call__(self, odds_A: np.ndarray, odds_B: np.ndarray,
+                 features: Optional[pd.DataFrame] = None) -> np.ndarray: ...
+
+def array_strategy(func: Callable) -> ArrayStrategy:
+    """Mark a function as an array strategy."""
+    func.is_array_strategy = True
+    return func
 
 def bet_on_smaller_odd(player_A: str, player_B: str, odd_A: str, odd_B: str) -> Optional[str]:
     if odd_A < odd_B:
@@ -16,4 +42,59 @@ def bet_on_smaller_odd_criteria(player_A: str, player_B: str, odd_A: str, odd_B:
     elif odd_A > odd_B:
         return player_B
     else: 
-        return None
\ No newline at end of file
+        return None
+
+@array_strategy
+def smaller_odd(odds_A: np.ndarray, odds_B: np.ndarray, features: Optional[pd.DataFrame] = None) -> np.ndarray:
+    """Bet on the favourite, skipping matches with equal (or missing) odds."""
+    picks = np.full(len(odds_A), NO_BET, dtype=np.int8)
+    picks[odds_A < odds_B] = PICK_A
+    picks[odds_A > odds_B] = PICK_B
+    return picks
+
+@array_strategy
+def smaller_odd_criteria(odds_A: np.ndarray, odds_B: np.ndarray, features: Optional[pd.DataFrame] = None,
+                         min_odd: float = 1.2) -> np.ndarray:
+    """Bet on the favourite, unless either price is at or below `min_odd`."""
+    picks = smaller_odd(odds_A, odds_B)
+    picks[(odds_A <= min_odd) | (odds_B <= min_odd)] = NO_BET
+    return picks
+
+# Array versions of the scalar strategies above
+ARRAY_EQUIVALENTS = {
+    bet_on_smaller_odd: smaller_odd,
+    bet_on_smaller_odd_criteria: smaller_odd_criteria,
+}
+
+def from_scalar(strategy: Callable) -> ArrayStrategy:
+    """
+    Adapt a legacy scalar strategy, called as strategy(player_A, player_B, odd_A, odd_B)
+    and returning the name of a player or None, to the array protocol.
+
+    Player names are read from the "Winner" (A) and "Loser" (B) columns of
+    `features`. The scalar strategy is still called once per match.
+    """
+    @array_strategy
+    def adapted(odds_A: np.ndarray, odds_B: np.ndarray, features: Optional[pd.DataFrame] = None) -> np.ndarray:
+        players_A = features["Winner"].to_numpy()
+        players_B = features["Loser"].to_numpy()
+        picks = np.full(len(odds_A), NO_BET, dtype=np.int8)
+        for i, (a, b, odd_a, odd_b) in enumerate(zip(players_A, players_B, odds_A, odds_B)):
+            decision = strategy(a, b, odd_a, odd_b)
+            if decision and decision == a:
+                picks[i] = PICK_A
+            elif decision and decision == b:
+                picks[i] = PICK_B
+        return picks
+
+    return adapted
+
+def as_array_strategy(strategy: Callable) -> ArrayStrategy:
+    """Return the array version of any strategy: itself, its known equivalent, or an adapter."""
+    # Array strategies with bound parameters, e.g. partial(smaller_odd_criteria, min_odd=1.5)
+    func = strategy.func if isinstance(strategy, functools.partial) else strategy
+    if getattr(func, "is_array_strategy", False):
+        return strategy
+    if strategy in ARRAY_EQUIVALENTS:
+        return ARRAY_EQUIVALENTS[strategy]
+    return from_scalar(strategy)
@@ -0,0 +1,139 @@
+"""
+Runs a parallel parameter sweep of the betting simulation over strategies, stakes and bankrolls.
+"""
+
+import argparse
+import functools
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_values import HOST, DBNAME, USER, PASSWORD
+from sql_queries import DATA_TO_SIMULATE_ORDERED
+from src.simulator import settle_matches
+from src.strategies import smaller_odd, smaller_odd_criteria
+
+# Strategies that can be swept, by name
+STRATEGIES = {
+    "smaller_odd": smaller_odd,
+    "smaller_odd_criteria": smaller_odd_criteria,
+}
+
+# Match odds shared read-only by the worker processes
+_odds: Optional[pd.DataFrame] = None
+
+
+def _share_odds(odds: pd.DataFrame) -> None:
+    """Keep the odds of every match in a module global, once per process."""
+    global _odds
+    _odds = odds
+
+
+def evaluate(combination: Dict) -> Dict:
+    """
+    Simulate one combination of the grid over the whole history with a single bankroll.
+
+    Returns the combination with its number of bets, win percentage, final
+    amount, net gain, return on the bankroll and maximum drawdown.
+    """
+    strategy = functools.partial(STRATEGIES[combination["strategy"]], **combination["params"])
+    stake, bankroll = combination["stake"], combination["bankroll"]
+
+    settled = settle_matches(_odds, stake, strategy)
+    placed = settled.placed
+    won = settled.won[placed]
+    net_result = settled.net_result[placed]
+
+    running_total = np.cumsum(np.concatenate(([bankroll], net_result)))
+    final_amount = running_total[-1]
+    max_drawdown = np.max(np.maximum.accumulate(running_total) - running_total)
+
+    return {
+        "strategy": combination["strategy"],
+        **combination["params"],
+        "stake": stake,
+        "bankroll": bankroll,
+        "num_bets": int(placed.sum()),
+        "win_percentage": round(won.mean() * 100, 2) if won.size else 0.0,
+        "final_amount": round(final_amount, 2),
+        "net_gain": round(final_amount - bankroll, 2),
+        "return_percentage": round((final_amount - bankroll) / bankroll * 100, 2),
+        "max_drawdown": round(max_drawdown, 2),
+    }
+
+
+def _evaluate_chunk(combinations: List[Dict]) -> List[Dict]:
+    """Evaluate a chunk of the grid in a worker process."""
+    return [evaluate(combination) for combination in combinations]
+
+
+def build_grid(min_odds: List[float], stakes: List[float], bankrolls: List[float]) -> List[Dict]:
+    """All combinations of strategy parameters, stakes and bankrolls."""
+    strategy_params = [("smaller_odd", {})] + [
+        ("smaller_odd_criteria", {"min_odd": min_odd}) for min_odd in min_odds
+    ]
+    return [
+        {"strategy": strategy, "params": params, "stake": stake, "bankroll": bankroll}
+        for (strategy, params), stake, bankroll in itertools.product(strategy_params, stakes, bankrolls)
+    ]
+
+
+def run_sweep(df: pd.DataFrame, grid: List[Dict], workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Evaluate every combination of `grid` on the matches of `df` in a process pool.
+
+    The odds are sent once to every worker, which then evaluates whole chunks
+    of the grid with `settle_matches`, like the other simulations. Returns the
+    results ranked by net gain.
+    """
+    odds = df[["AvgW", "AvgL"]].astype(float)
+    # Matches with a zero price are never bet on, drop them once rather than in every evaluation
+    odds = odds[(odds["AvgW"] != 0) & (odds["AvgL"] != 0)].reset_index(drop=True)
+    workers = workers or os.cpu_count()
+    chunks = [grid[i::workers] for i in range(workers)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_share_odds, initargs=(odds,)) as pool:
+        results = [result for chunk in pool.map(_evaluate_chunk, chunks) for result in chunk]
+
+    ranked = pd.DataFrame(results).sort_values("net_gain", ascending=False, kind="stable")
+    ranked.insert(0, "rank", np.arange(1, len(ranked) + 1))
+    return ranked.reset_index(drop=True)
+
+
+def load_simulation_data() -> pd.DataFrame:
+    """Load the matches and their average odds once from the database, in chronological order."""
+    with psycopg2.connect(host=HOST, dbname=DBNAME, user=USER, password=PASSWORD) as conn:
+        with conn.cursor() as cur:
+            cur.execute(DATA_TO_SIMULATE_ORDERED)
+            columns = [column.name for column in cur.description]
+            return pd.DataFrame(cur.fetchall(), columns=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep strategy parameters, stakes and bankrolls.")
+    parser.add_argument("--min-odds", type=float, nargs="+", default=[1.1, 1.2, 1.3, 1.4, 1.5],
+                        help="Odds floors tried with smaller_odd_criteria.")
+    parser.add_argument("--stakes", type=float, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--bankrolls", type=float, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core).")
+    parser.add_argument("--output", default="data/output/sweep_results.csv")
+    args = parser.parse_args()
+
+    grid = build_grid(args.min_odds, args.stakes, args.bankrolls)
+    results = run_sweep(load_simulation_data(), grid, args.workers)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    results.to_csv(args.output, index=False)
+    print(results.head(10).to_string(index=False))
+    print(f"{len(results)} combinations written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Tests of the change detection of incremental ETL loads.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from etl import compute_row_hashes, extract_data_from_excel, extract_data_from_csv, iter_source_chunks
+from workbook_cache import read_excel_cached
+
+
+def season_frame(n=40):
+    """A small season in the layout of the source files, with the fourth and fifth sets mostly missing."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "ATP": 1, "Location": "Melbourne", "Tournament": "Australian Open",
+        "Date": pd.to_datetime("2024-01-14") + pd.to_timedelta(np.arange(n) // 8, unit="D"),
+        "Series": "Grand Slam", "Court": "Outdoor", "Surface": "Hard", "Round": "1st Round", "Best of": 5,
+        "Winner": [f"Winner {i}." for i in range(n)], "Loser": [f"Loser {i}." for i in range(n)],
+        "WRank": rng.integers(1, 200, n), "LRank": rng.integers(1, 200, n),
+        "WPts": rng.integers(10, 9000, n), "LPts": rng.integers(10, 9000, n),
+    })
+    for set_number in range(1, 6):
+        df[f"W{set_number}"] = 6.0
+        df[f"L{set_number}"] = rng.integers(0, 5, n).astype(float)
+    # Only the last rows go to four or five sets, so the first chunks hold no value at all there
+    df.loc[: n - 5, ["W4", "L4", "W5", "L5"]] = np.nan
+    df["Wsets"], df["Lsets"], df["Comment"] = 3, 0, "Completed"
+    for prefix in ("B365", "PS", "Max", "Avg"):
+        df[f"{prefix}W"] = np.round(1 + rng.random(n), 2)
+        df[f"{prefix}L"] = np.round(1 + rng.random(n) * 4, 2)
+    df.loc[3, "PSW"] = np.nan
+    return df
+
+
+def chunked_hashes(path):
+    return pd.concat([compute_row_hashes(chunk) for chunk in iter_source_chunks(path, chunk_size=8)])
+
+
+def test_row_hashes_match_across_readers(tmp_path):
+    xlsx, csv = str(tmp_path / "2024.xlsx"), str(tmp_path / "2024.csv")
+    season_frame().to_excel(xlsx, index=False)
+    season_frame().to_csv(csv, index=False)
+
+    expected = compute_row_hashes(extract_data_from_excel(xlsx, use_cache=False))
+    for hashes in (chunked_hashes(xlsx), chunked_hashes(csv), compute_row_hashes(extract_data_from_csv(csv)),
+                   compute_row_hashes(read_excel_cached(xlsx, cache_dir=str(tmp_path / "cache")))):
+        pd.testing.assert_frame_equal(hashes.reset_index(drop=True), expected.reset_index(drop=True))
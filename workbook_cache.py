@@ -0,0 +1,69 @@
+"""
+Module providing an on-disk Parquet cache for parsed season workbooks
+"""
+
+import glob
+import hashlib
+import io
+import os
+import pandas as pd
+import requests
+from config import WORKBOOK_CACHE_DIR
+
+
+def read_source_bytes(source: str) -> bytes:
+    """Read the raw content of a local file or of a URL."""
+    if source.startswith(("http://", "https://")):
+        response = requests.get(source, timeout=60)
+        response.raise_for_status()
+        return response.content
+    with open(source, "rb") as f:
+        return f.read()
+
+def cache_path(source: str, content: bytes, cache_dir: str = WORKBOOK_CACHE_DIR) -> str:
+    """
+    Path of the cached copy of `source` for the given content.
+
+    The file name is made of a hash of the source name followed by a hash of
+    its content, so every version of a source lives under the same prefix.
+    """
+    source_digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+    content_digest = hashlib.sha256(content).hexdigest()[:32]
+    return os.path.join(cache_dir, f"{source_digest}-{content_digest}.parquet")
+
+def invalidate_stale_entries(path: str) -> None:
+    """Remove cached copies of older versions of the same source."""
+    prefix = os.path.basename(path).split("-")[0]
+    for stale in glob.glob(os.path.join(os.path.dirname(path), f"{prefix}-*.parquet")):
+        if stale != path:
+            os.remove(stale)
+
+def read_excel_cached(source: str, cache_dir: str = WORKBOOK_CACHE_DIR) -> pd.DataFrame:
+    """
+    Read a workbook through the Parquet cache.
+
+    The workbook is only parsed with `pd.read_excel` when its content has not
+    been seen before; the parsed frame is then stored as Parquet next to the
+    other cached workbooks and the entry of the previous content is dropped.
+    Frames Parquet cannot represent (e.g. columns mixing numbers and text)
+    are returned without being cached.
+    """
+    content = read_source_bytes(source)
+    path = cache_path(source, content, cache_dir)
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    df = pd.read_excel(io.BytesIO(content))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+    except (ImportError, ValueError, TypeError) as e:
+        print(f"Not caching {source}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return df
+    os.replace(tmp_path, path)
+    invalidate_stale_entries(path)
+    return df